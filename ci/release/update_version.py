@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# Copyright (c) 2026, NVIDIA CORPORATION.
+"""Update or check the RAPIDS versions used throughout the deployment docs.
+
+Usage::
+
+    python ci/release/update_version.py <new_version>
+    python ci/release/update_version.py --check [<new_version>]
+
+``<new_version>`` is formatted as ``YY.MM.PP``, with no leading ``v`` or trailing ``a``.
+Its ``YY.MM`` becomes the stable version and the following release becomes the nightly
+version. Each file is read and written once with every version in it updated.
+
+With ``--check`` nothing is written. Without a version the files are checked for
+consistency with the versions in ``source/conf.py``, otherwise they are checked against
+the given release. Any differences are printed and the exit code is 1.
+
+The release logic can be tested with ``python -m doctest ci/release/update_version.py``.
+
+"""
+
+import argparse
+import difflib
+import re
+import sys
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[2]
+
+# Patterns for every version in the repo by file, each with the version it should contain.
+# The version is the second group and is replaced with the surrounding groups kept as is.
+VERSION_PATTERNS = {
+    "source/conf.py": [
+        (re.compile(r'(stable_version = ")([0-9.]*)(")'), "stable"),
+        (re.compile(r'(nightly_version = ")([0-9.]*)(")'), "nightly"),
+    ],
+    "README.md": [
+        (
+            re.compile(
+                r'("rapids_container": "nvcr.io/nvidia/rapidsai/base:)([0-9.]*)(-)'
+            ),
+            "stable",
+        ),
+        (
+            re.compile(r'("rapids_container": "rapidsai/base:)([0-9.]*)(a-)'),
+            "nightly",
+        ),
+    ],
+}
+
+RELEASE = re.compile(r"(\d{2})\.(\d{2})(?:\.(\d{2}))?")
+
+
+def short_version(version: str) -> str:
+    """Get the ``YY.MM`` part of a release version.
+
+    >>> short_version("25.10.00")
+    '25.10'
+    >>> short_version("25.10")
+    '25.10'
+    >>> short_version("v25.10.00a")
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid release version 'v25.10.00a', expected YY.MM.PP
+
+    """
+    match = RELEASE.fullmatch(version)
+    if match is None:
+        raise ValueError(f"Invalid release version {version!r}, expected YY.MM.PP")
+    return f"{match[1]}.{match[2]}"
+
+
+def next_nightly(version: str) -> str:
+    """Get the release after ``version``, releases are every two months from February.
+
+    >>> next_nightly("25.08")
+    '25.10'
+    >>> next_nightly("25.10.00")
+    '25.12'
+    >>> next_nightly("25.12")
+    '26.02'
+
+    """
+    year, month = (int(part) for part in short_version(version).split("."))
+    if month == 12:
+        return f"{year + 1:02d}.02"
+    return f"{year:02d}.{month + 2:02d}"
+
+
+def read_versions(conf_text: str) -> dict[str, str]:
+    """Read the stable and nightly versions set in ``conf.py``.
+
+    >>> read_versions('stable_version = "25.10"\\nnightly_version = "25.12"\\n')
+    {'stable': '25.10', 'nightly': '25.12'}
+
+    """
+    versions = {}
+    for pattern, name in VERSION_PATTERNS["source/conf.py"]:
+        match = pattern.search(conf_text)
+        if match is None:
+            raise ValueError(f"Couldn't find the {name} version in source/conf.py")
+        versions[name] = match[2]
+    return versions
+
+
+def update_text(text: str, patterns: list, versions: dict[str, str]) -> str:
+    """Set every version in ``text`` in a single pass.
+
+    >>> update_text(
+    ...     '"rapids_container": "rapidsai/base:25.10a-cuda12-py3.13"',
+    ...     VERSION_PATTERNS["README.md"],
+    ...     {"stable": "25.10", "nightly": "25.12"},
+    ... )
+    '"rapids_container": "rapidsai/base:25.12a-cuda12-py3.13"'
+
+    """
+    combined = re.compile(
+        "|".join(
+            f"(?P<p{i}>{pattern.pattern})" for i, (pattern, _) in enumerate(patterns)
+        )
+    )
+
+    def replace(match: re.Match) -> str:
+        i = int(match.lastgroup[1:])
+        pattern, name = patterns[i]
+        prefix, _, suffix = pattern.fullmatch(match[0]).groups()
+        return prefix + versions[name] + suffix
+
+    return combined.sub(replace, text)
+
+
+def update_files(versions: dict[str, str], check: bool) -> bool:
+    """Update or check every file, returning whether they are all up to date."""
+    up_to_date = True
+    for filename, patterns in VERSION_PATTERNS.items():
+        path = repo_root / filename
+        text = path.read_text()
+        for pattern, name in patterns:
+            if pattern.search(text) is None:
+                raise ValueError(f"Couldn't find the {name} version in {filename}")
+        updated = update_text(text, patterns, versions)
+        if updated == text:
+            continue
+        up_to_date = False
+        if check:
+            sys.stdout.writelines(
+                difflib.unified_diff(
+                    text.splitlines(keepends=True),
+                    updated.splitlines(keepends=True),
+                    f"a/{filename}",
+                    f"b/{filename}",
+                )
+            )
+        else:
+            path.write_text(updated)
+    return up_to_date
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Update the RAPIDS versions in the docs"
+    )
+    parser.add_argument("version", nargs="?", help="Release version as YY.MM.PP")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Show the changes that are needed instead of making them",
+    )
+    args = parser.parse_args()
+
+    if args.version is not None:
+        stable = short_version(args.version)
+        versions = {"stable": stable, "nightly": next_nightly(stable)}
+        if not args.check:
+            print(
+                f"Preparing release {args.version} "
+                f"with next nightly version {versions['nightly']}"
+            )
+    elif args.check:
+        versions = read_versions((repo_root / "source" / "conf.py").read_text())
+        if versions["nightly"] != next_nightly(versions["stable"]):
+            sys.exit(
+                f"nightly_version {versions['nightly']} doesn't follow "
+                f"stable_version {versions['stable']} in source/conf.py"
+            )
+    else:
+        parser.error("a version is required unless --check is used")
+
+    up_to_date = update_files(versions, args.check)
+    if args.check:
+        if not up_to_date:
+            sys.exit(1)
+        print(
+            f"Versions are consistent: stable {versions['stable']}, "
+            f"nightly {versions['nightly']}"
+        )
+    else:
+        print("Version update complete")
+
+
+if __name__ == "__main__":
+    main()
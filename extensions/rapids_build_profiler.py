@@ -0,0 +1,219 @@
+import csv
+import json
+import os
+import time
+from functools import wraps
+
+from docutils.parsers.rst import directives
+from sphinx.application import Sphinx
+from sphinx.config import Config
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# Positional argument (after ``app``) holding the docname for events that pass one,
+# other events are attributed to the document being read, if any
+EVENT_DOCNAME_ARGS = {
+    "source-read": 0,
+    "env-purge-doc": 1,
+    "doctree-resolved": 1,
+    "html-page-context": 0,
+}
+
+
+class BuildProfile:
+    """Wall time, call counts and bytes written by the custom extensions.
+
+    Records are keyed by extension, the event or directive and the docname being
+    processed, or an empty docname for events which aren't tied to a single page.
+
+    """
+
+    def __init__(self, app: Sphinx):
+        self.app = app
+        self.records = {}
+        self.current = []
+
+    def record(self, extension: str, kind: str, name: str, docname: str) -> list:
+        key = (extension, kind, name, docname)
+        try:
+            return self.records[key]
+        except KeyError:
+            record = self.records[key] = [0, 0.0, 0]
+            return record
+
+    def timed(self, extension: str, kind: str, name: str, docname: str, func, *args):
+        record = self.record(extension, kind, name, docname)
+        self.current.append(record)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            record[0] += 1
+            record[1] += time.perf_counter() - start
+            self.current.pop()
+
+    def add_bytes_written(self, app: Sphinx, path, nbytes: int) -> None:
+        if self.current:
+            self.current[-1][2] += nbytes
+
+    def current_docname(self) -> str:
+        try:
+            return self.app.env.docname or ""
+        except AttributeError:
+            return ""
+
+    def wrap_handler(self, event: str, handler):
+        extension = handler.__module__
+        docname_arg = EVENT_DOCNAME_ARGS.get(event)
+
+        @wraps(handler)
+        def profiled_handler(app, *args):
+            if docname_arg is not None and len(args) > docname_arg:
+                docname = args[docname_arg]
+            else:
+                docname = self.current_docname()
+            return self.timed(extension, "event", event, docname, handler, app, *args)
+
+        return profiled_handler
+
+    def wrap_directive(self, name: str, cls: type) -> type:
+        profile = self
+
+        def run(self):
+            return profile.timed(
+                cls.__module__,
+                "directive",
+                name,
+                profile.current_docname(),
+                super(profiled_cls, self).run,
+            )
+
+        profiled_cls = type(cls.__name__, (cls,), {"run": run})
+        return profiled_cls
+
+    def rows(self) -> list[dict]:
+        return [
+            {
+                "extension": extension,
+                "kind": kind,
+                "name": name,
+                "docname": docname,
+                "calls": calls,
+                "seconds": seconds,
+                "bytes_written": nbytes,
+            }
+            for (extension, kind, name, docname), (calls, seconds, nbytes) in sorted(
+                self.records.items()
+            )
+        ]
+
+    def write_report(self, path: str) -> None:
+        rows = self.rows()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if path.endswith(".csv"):
+            with open(path, "w", newline="") as writer:
+                csv_writer = csv.DictWriter(
+                    writer,
+                    fieldnames=[
+                        "extension",
+                        "kind",
+                        "name",
+                        "docname",
+                        "calls",
+                        "seconds",
+                        "bytes_written",
+                    ],
+                )
+                csv_writer.writeheader()
+                csv_writer.writerows(rows)
+        else:
+            with open(path, "w") as writer:
+                json.dump(rows, writer, indent=2)
+
+    def summary(self, top: int) -> list[str]:
+        """Summarise the slowest handlers and the pages they spent most time on."""
+        totals = {}
+        for (extension, kind, name, _), (
+            calls,
+            seconds,
+            nbytes,
+        ) in self.records.items():
+            total = totals.setdefault((extension, kind, name), [0, 0.0, 0])
+            total[0] += calls
+            total[1] += seconds
+            total[2] += nbytes
+        lines = [f"Top {top} custom extension handlers by wall time:"]
+        for (extension, kind, name), (calls, seconds, nbytes) in sorted(
+            totals.items(), key=lambda item: item[1][1], reverse=True
+        )[:top]:
+            lines.append(
+                f"  {seconds:8.3f}s {calls:6d} calls {nbytes / 1e6:9.2f} MB "
+                f"{extension} {kind} {name}"
+            )
+        lines.append(f"Top {top} pages by wall time:")
+        for (extension, kind, name, docname), (_, seconds, _) in sorted(
+            ((key, value) for key, value in self.records.items() if key[3]),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )[:top]:
+            lines.append(f"  {seconds:8.3f}s {docname} ({extension} {kind} {name})")
+        return lines
+
+
+def is_profiled(obj) -> bool:
+    module = getattr(obj, "__module__", None) or ""
+    return module.startswith("rapids_") and module != __name__
+
+
+def install_profiler(app: Sphinx, config: Config) -> None:
+    """Wrap the event handlers and directives registered by the ``rapids_*`` extensions."""
+    if not config.rapids_build_profile:
+        return
+
+    profile = app.rapids_build_profile = BuildProfile(app)
+
+    for event, listeners in app.events.listeners.items():
+        for i, listener in enumerate(listeners):
+            if is_profiled(listener.handler):
+                listeners[i] = listener._replace(
+                    handler=profile.wrap_handler(event, listener.handler)
+                )
+
+    for name, cls in list(directives._directives.items()):
+        if is_profiled(cls):
+            app.add_directive(name, profile.wrap_directive(name, cls), override=True)
+
+    if "rapids-notebook-files-written" in app.events.events:
+        app.connect("rapids-notebook-files-written", profile.add_bytes_written)
+    app.connect("build-finished", report_profile)
+
+
+def report_profile(app: Sphinx, exception: Exception | None) -> None:
+    profile = app.rapids_build_profile
+    path = app.config.rapids_build_profile_output or os.path.join(
+        app.doctreedir, "rapids-build-profile.json"
+    )
+    profile.write_report(path)
+    for line in profile.summary(app.config.rapids_build_profile_top):
+        logger.info(line)
+    logger.info(f"Custom extension build profile written to {path}")
+    if app.parallel > 1:
+        logger.warning(
+            "rapids_build_profiler only sees work done in the main process, "
+            "build with -j 1 for a complete profile"
+        )
+
+
+def setup(app: Sphinx) -> dict:
+    app.add_config_value("rapids_build_profile", False, "")
+    # Report path, the format is CSV if it ends in .csv and JSON otherwise
+    app.add_config_value("rapids_build_profile_output", "", "")
+    app.add_config_value("rapids_build_profile_top", 10, "")
+    app.connect("config-inited", install_profiler)
+
+    return {
+        "version": "0.1",
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
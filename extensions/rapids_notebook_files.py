@@ -1,47 +1,308 @@
 import contextlib
+import json
 import os
 import pathlib
-import re
 import shutil
-import tempfile
-from functools import partial
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
-import jinja2
+from rapids_version_templating import get_substitution_context
 
+try:
+    import fcntl
+except ImportError:  # Windows, where Sphinx can't build in parallel anyway
+    fcntl = None
 
-def template_func(app, match):
-    template = jinja2.Template(match.group())
-    return template.render(app.config.rapids_version)
+# Zip timestamps can't predate 1980, use that for every entry so archives are reproducible
+ARCHIVE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
 
+# How nbformat starts a notebook file and indents the keys and source lines of each cell
+NOTEBOOK_START = b'{\n "cells": [\n'
+CELL_KEY_INDENT = b"   "
+SOURCE_LINE_INDENT = b"    "
 
-def walk_files(app, dir, outdir):
+
+def template_text(app, text: str) -> str:
+    return get_substitution_context(app).substitute(text)
+
+
+def template_json_line(app, line: bytes, start: int) -> bytes:
+    """Template the JSON string starting at ``start`` in a line of a notebook file."""
+    content = line.rstrip(b"\r\n")
+    value = content[start:]
+    comma = b"," if value.endswith(b",") else b""
+    text = json.loads(value[: len(value) - len(comma)])
+    templated = template_text(app, text)
+    if templated == text:
+        return line
+    return (
+        line[:start]
+        + json.dumps(templated, ensure_ascii=False).encode("utf-8")
+        + comma
+        + line[len(content) :]
+    )
+
+
+def template_notebook(app, page, output) -> None:
+    """Write a copy of a notebook with templating applied to the source of its cells.
+
+    The notebook is streamed a line at a time. ``nbformat`` writes each line of a cell's
+    source on its own line of JSON, so only those containing ``{{`` are decoded, templated
+    and encoded again. Everything else, including outputs holding large base64 images,
+    is copied through byte for byte. Notebooks which aren't laid out the way ``nbformat``
+    writes them are templated as a whole instead.
+
+    """
+    with open(str(page), "rb") as reader, open(str(output), "wb") as writer:
+        start = reader.readline() + reader.readline()
+        if start.replace(b"\r\n", b"\n") != NOTEBOOK_START:
+            notebook = (start + reader.read()).decode("utf-8")
+            writer.write(template_text(app, notebook).encode("utf-8"))
+            return
+        writer.write(start)
+
+        in_source = False
+        for line in reader:
+            if in_source:
+                if line.startswith(SOURCE_LINE_INDENT) and b"{{" in line:
+                    line = template_json_line(app, line, len(SOURCE_LINE_INDENT))
+                elif line.startswith(CELL_KEY_INDENT + b"]"):
+                    in_source = False
+            elif line.startswith(CELL_KEY_INDENT + b'"source": '):
+                if line.rstrip().endswith(b"["):
+                    in_source = True
+                elif b"{{" in line:
+                    line = template_json_line(
+                        app, line, len(CELL_KEY_INDENT + b'"source": ')
+                    )
+            elif line.startswith(b" ]"):
+                # End of the cells, the notebook metadata is copied as is
+                writer.write(line)
+                shutil.copyfileobj(reader, writer, 1024 * 1024)
+                return
+            writer.write(line)
+
+
+def config_hash(app) -> str:
+    """Hash the templating config so cached notebook output is invalidated when versions change."""
+    return get_substitution_context(app).fingerprint
+
+
+def manifest_path(app, rel_page_parent: pathlib.Path) -> pathlib.Path:
+    """Location of the related files manifest for an example directory.
+
+    Manifests live alongside the doctrees rather than in the output directory so they
+    don't get published with the site.
+
+    """
+    name = "__".join(rel_page_parent.parts) + ".json"
+    return pathlib.Path(app.doctreedir) / "rapids_notebook_files" / name
+
+
+def load_manifest(path: pathlib.Path) -> dict:
+    try:
+        with open(str(path)) as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path: pathlib.Path, manifest: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(str(tmp_path), "w") as writer:
+        json.dump(manifest, writer, sort_keys=True)
+    os.replace(str(tmp_path), str(path))
+
+
+@contextlib.contextmanager
+def example_lock(app, rel_page_parent: pathlib.Path):
+    """Hold an exclusive lock on the output of an example directory.
+
+    With ``sphinx-build -j`` pages are written by several processes, so two notebooks in
+    the same example (or in one of its subdirectories) could otherwise copy, zip and
+    record the same files at the same time. The lock covers the whole example directory,
+    e.g ``examples/foo``, and is released when the process exits even if it crashes.
+
+    """
+    if fcntl is None:
+        yield
+        return
+    parts = rel_page_parent.parts
+    if "examples" in parts:
+        parts = parts[: parts.index("examples") + 2]
+    lock_path = manifest_path(app, pathlib.Path(*parts)).with_suffix(".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(str(lock_path), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def copy_related_file(app, page, output):
+    """Copy a single related file to the output directory applying templating to notebooks.
+
+    The file is written next to ``output`` and renamed into place so the output is never
+    left partially written. Returns the number of bytes written.
+
+    """
+    tmp_output = output.with_name(output.name + ".tmp")
+    if "ipynb" in page.name:
+        template_notebook(app, page, tmp_output)
+    else:
+        shutil.copy(str(page), str(tmp_output))
+    os.replace(str(tmp_output), str(output))
+    return os.path.getsize(str(output))
+
+
+def _walk_files(app, dir, outdir, manifest, previous, executor, futures):
     outdir.mkdir(parents=True, exist_ok=True)
     related_notebook_files = {}
     for page in dir.glob("*"):
         if page.is_dir():
-            related_notebook_files[page.name] = walk_files(
-                app, page, outdir / page.name
+            related_notebook_files[page.name] = _walk_files(
+                app, page, outdir / page.name, manifest, previous, executor, futures
             )
         else:
-            with contextlib.suppress(OSError):
-                os.remove(str(outdir / page.name))
-            if "ipynb" in page.name:
-                with open(str(page)) as reader:
-                    notebook = reader.read()
-                    with open(str(outdir / page.name), "w") as writer:
-                        writer.write(
-                            re.sub(
-                                r"(?<!\$)\{\{.*?\}\}",
-                                partial(template_func, app),
-                                notebook,
-                            )
-                        )
-            else:
-                shutil.copy(str(page), str(outdir / page.name))
+            stat = page.stat()
+            key = [
+                stat.st_mtime_ns,
+                stat.st_size,
+                config_hash(app) if "ipynb" in page.name else None,
+            ]
+            manifest[str(page)] = key
             related_notebook_files[page.name] = page.name
+            if previous.get(str(page)) == key and (outdir / page.name).exists():
+                continue
+            futures.append(
+                executor.submit(copy_related_file, app, page, outdir / page.name)
+            )
+    return related_notebook_files
+
+
+def walk_files(app, dir, outdir, manifest=None, previous=None):
+    """Copy all files in ``dir`` to ``outdir`` applying templating to notebooks.
+
+    When a ``manifest`` dict is passed each source file is recorded in it keyed by path
+    along with its mtime, size and (for notebooks) the templating config hash. Files whose
+    entry matches the ``previous`` manifest and whose output still exists are skipped.
+
+    The directory tree is walked up front and the copies are handed to a thread pool
+    sized by the ``rapids_notebook_files_workers`` config option. Once they finish the
+    ``rapids-notebook-files-written`` event is emitted with the number of bytes written.
+
+    """
+    if manifest is None:
+        manifest = {}
+    if previous is None:
+        previous = {}
+    futures = []
+    with ThreadPoolExecutor(
+        max_workers=app.config.rapids_notebook_files_workers
+    ) as executor:
+        related_notebook_files = _walk_files(
+            app, dir, outdir, manifest, previous, executor, futures
+        )
+        written = sum(future.result() for future in futures)
+    app.emit("rapids-notebook-files-written", outdir, written)
     return related_notebook_files
 
 
+def archive_members(root, related_notebook_files, prefix=""):
+    """Yield ``(arcname, path)`` pairs for a related files tree in a stable order.
+
+    Directories are yielded with a trailing slash and a path of ``None``.
+
+    """
+    for name in sorted(related_notebook_files):
+        arcname = prefix + name
+        if isinstance(related_notebook_files[name], dict):
+            yield arcname + "/", None
+            yield from archive_members(
+                root / name, related_notebook_files[name], arcname + "/"
+            )
+        else:
+            yield arcname, root / name
+
+
+def write_archive(archive_path, root, related_notebook_files, stored_suffixes=()):
+    """Write the related files tree under ``root`` to a zip archive.
+
+    Members are streamed straight into a temporary file next to the archive which is then
+    renamed into place. Entries are sorted and have fixed timestamps and permissions so that
+    archives of the same files are byte for byte identical. Files with a suffix in
+    ``stored_suffixes`` are already compressed so are stored without deflating them again.
+
+    Returns the size of the archive in bytes.
+
+    """
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    with zipfile.ZipFile(str(tmp_path), "w", zipfile.ZIP_DEFLATED) as archive:
+        for arcname, path in archive_members(
+            root.parent, {root.name: related_notebook_files}
+        ):
+            info = zipfile.ZipInfo(arcname, date_time=ARCHIVE_DATE_TIME)
+            if path is None:
+                info.external_attr = 0o40755 << 16 | 0x10
+                archive.writestr(info, b"")
+                continue
+            executable = os.stat(str(path)).st_mode & 0o111
+            info.external_attr = (0o100755 if executable else 0o100644) << 16
+            if path.suffix.lower() in stored_suffixes:
+                info.compress_type = zipfile.ZIP_STORED
+            else:
+                info.compress_type = zipfile.ZIP_DEFLATED
+            with open(str(path), "rb") as reader, archive.open(info, "w") as writer:
+                shutil.copyfileobj(reader, writer, 1024 * 1024)
+    os.replace(str(tmp_path), str(archive_path))
+    return os.path.getsize(str(archive_path))
+
+
+def materialise_example_dir(app, rel_page_parent: pathlib.Path):
+    """Copy, template and zip the files of an example directory into the output.
+
+    Returns the tree of related files and the name of the archive, or ``None`` if the
+    directory only contains the notebook.
+
+    """
+    path_to_page_parent = pathlib.Path(app.srcdir) / rel_page_parent
+    path_to_output_parent = pathlib.Path(app.builder.outdir) / rel_page_parent
+
+    with example_lock(app, rel_page_parent):
+        # Copy all related files to output and apply templating
+        manifest_file = manifest_path(app, rel_page_parent)
+        previous_manifest = load_manifest(manifest_file)
+        manifest = {}
+        related_notebook_files = walk_files(
+            app,
+            path_to_page_parent,
+            path_to_output_parent,
+            manifest,
+            previous_manifest.get("files", {}),
+        )
+
+        # Make archive of related files
+        archive_name = None
+        if related_notebook_files and len(related_notebook_files) > 1:
+            archive_path = path_to_output_parent / "all_files.zip"
+            if manifest != previous_manifest.get("files") or not archive_path.exists():
+                written = write_archive(
+                    archive_path,
+                    path_to_output_parent,
+                    related_notebook_files,
+                    app.config.rapids_notebook_files_archive_stored_suffixes,
+                )
+                app.emit("rapids-notebook-files-written", archive_path, written)
+            archive_name = archive_path.name
+
+        if manifest != previous_manifest.get("files"):
+            save_manifest(manifest_file, {"files": manifest})
+
+    return related_notebook_files, archive_name
+
+
 def find_notebook_related_files(app, pagename, templatename, context, doctree):
     """Find related files for Jupyter Notebooks in the examples section.
 
@@ -53,38 +314,43 @@ def find_notebook_related_files(app, pagename, templatename, context, doctree):
     them in the sidebar. To get the GitHub url we use the ``rapids_deployment_notebooks_base_url`` config
     option which shows the base url for where the source files are on GitHub.
 
+    To keep incremental builds fast a manifest of the files copied for each directory is
+    stored in the doctree directory. Files and archives which haven't changed since the
+    last build are not copied or zipped again. Each directory is only materialised once
+    per build, further notebooks in the same directory share the result.
+
     """
     if "examples/" in pagename and context["page_source_suffix"] == ".ipynb":
-        source_root = pathlib.Path(__file__).parent / ".." / "source"
-        output_root = pathlib.Path(app.builder.outdir)
         rel_page_parent = pathlib.Path(pagename).parent
-        path_to_page_parent = source_root / rel_page_parent
-        path_to_output_parent = output_root / rel_page_parent
+        try:
+            related_notebook_files, archive_name = app.rapids_example_dirs[
+                rel_page_parent
+            ]
+        except KeyError:
+            related_notebook_files, archive_name = app.rapids_example_dirs[
+                rel_page_parent
+            ] = materialise_example_dir(app, rel_page_parent)
 
-        # Copy all related files to output and apply templating
-        related_notebook_files = walk_files(
-            app, path_to_page_parent, path_to_output_parent
-        )
-
-        # Make archive of related files
-        if related_notebook_files and len(related_notebook_files) > 1:
-            archive_path = path_to_output_parent / "all_files.zip"
-            with contextlib.suppress(OSError):
-                os.remove(str(archive_path))
-            with tempfile.NamedTemporaryFile() as tmpf:
-                shutil.make_archive(
-                    tmpf.name,
-                    "zip",
-                    str(path_to_output_parent.parent),
-                    str(path_to_output_parent.name),
-                )
-                shutil.move(tmpf.name + ".zip", str(archive_path))
-            context["related_notebook_files_archive"] = archive_path.name
+        if archive_name is not None:
+            context["related_notebook_files_archive"] = archive_name
         context["related_notebook_files"] = related_notebook_files
 
 
+def init_example_dirs(app):
+    app.rapids_example_dirs = {}
+
+
 def setup(app):
     app.add_config_value("rapids_deployment_notebooks_base_url", "", "html")
+    # Number of threads used to copy related files, defaults to ThreadPoolExecutor's choice
+    app.add_config_value("rapids_notebook_files_workers", None, "", types=(int,))
+    app.add_config_value(
+        "rapids_notebook_files_archive_stored_suffixes",
+        [".png", ".jpg", ".jpeg", ".gif", ".zip", ".gz", ".parquet", ".xgb"],
+        "",
+    )
+    app.add_event("rapids-notebook-files-written")
+    app.connect("builder-inited", init_example_dirs)
     app.connect("html-page-context", find_notebook_related_files)
 
     return {
@@ -1,25 +1,122 @@
-from functools import cache
+import bisect
+import hashlib
+import json
+import os
+import re
 
 import nbformat
 from docutils import nodes
 from docutils.parsers.rst.states import RSTState
 from docutils.statemachine import ViewList
 from markdown_it import MarkdownIt
+from sphinx import addnodes
 from sphinx.application import Sphinx
 from sphinx.directives.other import TocTree
 from sphinx.environment import BuildEnvironment
 from sphinx.util.docutils import SphinxDirective
 from sphinx.util.nodes import nested_parse_with_titles
 
+markdown_parser = MarkdownIt()
 
-@cache
-def read_notebook_tags(path: str) -> list[str]:
-    """Read metadata tags from first cell of a notebook file."""
-    notebook = nbformat.read(path, as_version=4)
+# Parsed notebook card grids keyed by notebook metadata version and list of notebooks
+grid_cache: dict[tuple[str, tuple[str, ...]], list[nodes.Node]] = {}
+
+# Start of a notebook file as written by nbformat, up to the opening of the cells list
+CELLS_START = re.compile(r'\s*\{\s*"cells"\s*:\s*\[')
+
+
+def read_notebook_metadata(path: str) -> dict:
+    """Read the title and first cell tags of a notebook file in a single pass.
+
+    The cells are scanned incrementally so reading stops as soon as the title is found,
+    without loading any outputs further down the notebook. Notebooks the scanner can't
+    handle are read in full with ``nbformat`` instead.
+
+    """
+    mtime = os.stat(path).st_mtime_ns
     try:
-        return notebook.cells[0]["metadata"]["tags"]
-    except KeyError:
-        return []
+        tags, title = scan_notebook_header(path)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        notebook = nbformat.read(path, as_version=4)
+        try:
+            tags = list(notebook.cells[0]["metadata"]["tags"])
+        except (IndexError, KeyError):
+            tags = []
+        try:
+            title = get_title_for_notebook(notebook)
+        except ValueError:
+            title = None
+    return {"title": title, "tags": tags, "mtime": mtime}
+
+
+def iter_notebook_cells(path: str, chunk_size: int = 64 * 1024):
+    """Yield the cells of a notebook file one at a time without reading the whole file.
+
+    Only notebooks where ``cells`` is the first key are supported, which is how
+    ``nbformat`` writes them. Raises ``ValueError`` for anything else.
+
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as reader:
+        buffer = reader.read(chunk_size)
+        match = CELLS_START.match(buffer)
+        while match is None and len(buffer) < 1024:
+            more = reader.read(chunk_size)
+            if not more:
+                break
+            buffer += more
+            match = CELLS_START.match(buffer)
+        if match is None:
+            raise ValueError("Notebook doesn't start with a list of cells")
+        pos = match.end()
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                cell, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Most likely the cell continues past the end of the buffer so read more,
+                # growing the read size to avoid re-parsing large cells too many times
+                more = reader.read(max(chunk_size, len(buffer) - pos))
+                if not more:
+                    raise
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield cell
+            buffer, pos = buffer[end:], 0
+
+
+def scan_notebook_header(path: str) -> tuple[list[str], str | None]:
+    """Find the first cell tags and top-level heading of a notebook file."""
+    tags = []
+    for i, cell in enumerate(iter_notebook_cells(path)):
+        if i == 0:
+            tags = list(cell.get("metadata", {}).get("tags", []))
+        if cell["cell_type"] == "markdown":
+            source = cell["source"]
+            if isinstance(source, list):
+                source = "".join(source)
+            title = get_title_for_markdown(source)
+            if title is not None:
+                return tags, title
+    return tags, None
+
+
+def get_notebook_metadata(env: BuildEnvironment, docname: str) -> dict:
+    """Get the metadata record for a notebook.
+
+    Records are cached in ``env.notebook_metadata`` so they persist across incremental
+    builds, and are only read again when the notebook's mtime changes.
+
+    """
+    path = os.fspath(env.doc2path(docname))
+    metadata = env.notebook_metadata.get(docname)
+    if metadata is None or metadata["mtime"] != os.stat(path).st_mtime_ns:
+        metadata = env.notebook_metadata[docname] = read_notebook_metadata(path)
+    return metadata
 
 
 def generate_notebook_grid_myst(
@@ -40,13 +137,11 @@ def generate_notebook_grid_myst(
         md.append("````{grid-item-card}")
         md.append(":link: /" + notebook)
         md.append(":link-type: doc")
-        try:
-            md.append(get_title_for_notebook(env.doc2path(notebook)))
-        except ValueError:
-            md.append(notebook)
+        metadata = get_notebook_metadata(env, notebook)
+        md.append(metadata["title"] or notebook)
         md.append("^" * len(notebook))
         md.append("")
-        for tag in read_notebook_tags(env.doc2path(notebook)):
+        for tag in metadata["tags"]:
             md.append("{bdg}`" + tag + "`")
         md.append("````")
         md.append("")
@@ -65,22 +160,60 @@ def parse_markdown(markdown: list[str], state: RSTState) -> list[nodes.Node]:
     return node.children
 
 
-def get_title_for_notebook(path: str) -> str:
-    """Read a notebook file and find the top-level heading."""
-    notebook = nbformat.read(path, as_version=4)
+def render_notebook_grid(
+    notebooks: list[str],
+    env: BuildEnvironment,
+    state: RSTState,
+    source_info: tuple[str, int],
+) -> list[nodes.Node]:
+    """Render a grid of notebook cards into nodes.
+
+    Many pages show the same list of notebooks so the parsed nodes are cached, keyed by
+    the notebook list and the version of the notebook metadata, and each page gets its
+    own deep copy with the cross references and source location pointing back at it.
+
+    """
+    key = (env.notebook_metadata_version, tuple(notebooks))
+    try:
+        grid = grid_cache[key]
+    except KeyError:
+        grid = grid_cache[key] = parse_markdown(
+            markdown=generate_notebook_grid_myst(notebooks=notebooks, env=env),
+            state=state,
+        )
+    source, line = source_info
+    copies = [node.deepcopy() for node in grid]
+    for copy in copies:
+        for node in copy.findall():
+            node.source, node.line = source, line
+        for xref in copy.findall(addnodes.pending_xref):
+            xref["refdoc"] = env.docname
+    return copies
+
+
+def get_title_for_markdown(source: str) -> str | None:
+    """Find the top-level heading in some markdown."""
+    tokens = markdown_parser.parse(source)
+    for i, token in enumerate(tokens):
+        if i == len(tokens) - 1:  # no next_token
+            continue
+        next_token = tokens[i + 1]
+        if (
+            token.type == "heading_open"
+            and token.tag == "h1"
+            and next_token.type == "inline"
+        ):
+            return next_token.content
+    return None
+
+
+def get_title_for_notebook(notebook: nbformat.NotebookNode) -> str:
+    """Find the top-level heading in a notebook."""
     for cell in notebook.cells:
         if cell["cell_type"] == "markdown":
-            cell_source = MarkdownIt().parse(cell["source"])
-            for i, token in enumerate(cell_source):
-                if i == len(cell_source) - 1:  # no next_token
-                    continue
-                next_token = cell_source[i + 1]
-                if (
-                    token.type == "heading_open"
-                    and token.tag == "h1"
-                    and next_token.type == "inline"
-                ):
-                    return next_token.content
+            title = get_title_for_markdown(cell["source"])
+            if title is not None:
+                return title
     raise ValueError("No top-level heading found")
 
 
@@ -90,13 +223,11 @@ class RelatedExamples(SphinxDirective):
 
         if self.env.docname in self.env.notebook_tag_map:
             output += nodes.title("Related Examples", "Related Examples")
-            grid_markdown = generate_notebook_grid_myst(
+            for node in render_notebook_grid(
                 notebooks=self.env.notebook_tag_map[self.env.docname],
                 env=self.env,
-            )
-            for node in parse_markdown(
-                markdown=grid_markdown,
                 state=self.state,
+                source_info=self.get_source_info(),
             ):
                 output += node
 
@@ -108,47 +239,127 @@ def build_tag_map(app: Sphinx, env: BuildEnvironment, docnames: list[str]):
     """Walk notebooks and update tag map.
 
     Once Sphinx has decided which pages to build, iterate over the notebooks
-    and build the ``env.notebook_tag_map`` based on the tags of the first cell.
+    and update the ``env.notebook_tag_map`` based on the tags of the first cell.
 
-    If any notebooks have been updated as part of this build then add all of the
-    pages with related tags to the build to ensure they are up to date.
+    The tags of each notebook are kept in ``env.notebook_tags`` so that only
+    notebooks whose title or tags have changed since the last build are updated
+    in the tag map. Pages whose related examples grid shows one of those notebooks,
+    either the page named after one of its old or new tags or a notebook gallery,
+    are added to the build to ensure they are up to date.
+
+    The tag tree used for the gallery filters is also computed here so page context
+    setup doesn't need to walk the tags for every page.
 
     """
+    previous = {
+        doc: (metadata["title"], metadata["tags"])
+        for doc, metadata in env.notebook_metadata.items()
+    }
+    notebooks = [
+        doc for doc in env.found_docs if os.fspath(env.doc2path(doc)).endswith("ipynb")
+    ]
+    for doc in list(env.notebook_metadata):
+        if doc not in notebooks:
+            del env.notebook_metadata[doc]
+    current = {}
+    for doc in notebooks:
+        metadata = get_notebook_metadata(env, doc)
+        current[doc] = (metadata["title"], metadata["tags"])
+
+    changed_notebooks = {
+        doc
+        for doc in previous.keys() | current.keys()
+        if previous.get(doc) != current.get(doc)
+    }
+    if not changed_notebooks:
+        return
+    env.notebook_metadata_version = hashlib.sha256(
+        json.dumps(sorted(current.items())).encode()
+    ).hexdigest()
+
+    # Grids parsed for earlier versions of the metadata can't be used again
+    for key in [key for key in grid_cache if key[0] != env.notebook_metadata_version]:
+        del grid_cache[key]
+
+    # Update the tag map for notebooks that have changed
+    changed_tags = set()
+    for doc in sorted(changed_notebooks):
+        old_tags = env.notebook_tags.pop(doc, [])
+        new_tags = current[doc][1] if doc in current else []
+        for tag in old_tags:
+            env.notebook_tag_map[tag].remove(doc)
+            if not env.notebook_tag_map[tag]:
+                del env.notebook_tag_map[tag]
+        for tag in new_tags:
+            bisect.insort(env.notebook_tag_map.setdefault(tag, []), doc)
+        if doc in current:
+            env.notebook_tags[doc] = new_tags
+        changed_tags.update(old_tags, new_tags)
+    env.notebook_tag_tree = build_tag_tree(env.notebook_tag_map)
+
+    # Rebuild pages whose related examples or gallery grids show changed notebooks
+    dependent_docs = (changed_tags | env.notebook_gallery_docs) & env.found_docs
+    for doc in sorted(dependent_docs):
+        if doc not in docnames:
+            docnames.append(doc)
+
+
+def init_notebook_tag_map(app: Sphinx):
+    # Cached grids belong to a single build, they aren't shared between Sphinx apps
+    grid_cache.clear()
+    if not hasattr(app.env, "notebook_metadata"):
+        app.env.notebook_metadata = {}
+        app.env.notebook_metadata_version = ""
+        app.env.notebook_tags = {}
+        app.env.notebook_tag_map = {}
+        app.env.notebook_tag_tree = {}
+        app.env.notebook_gallery_docs = set()
+
+
+def purge_notebook_gallery_doc(app: Sphinx, env: BuildEnvironment, docname: str):
+    env.notebook_gallery_docs.discard(docname)
+
+
+def merge_notebook_gallery_docs(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+):
+    env.notebook_gallery_docs |= other.notebook_gallery_docs & set(docnames)
+
+
+def merge_notebook_metadata(
+    app: Sphinx, env: BuildEnvironment, docnames: set[str], other: BuildEnvironment
+):
+    """Keep notebook metadata read by parallel workers.
+
+    The tag map is built in the main process before reading starts so every worker sees
+    the same one, but workers may read metadata for notebooks which aren't cached yet.
 
-    env.notebook_tag_map = {}
+    """
+    for doc, metadata in other.notebook_metadata.items():
+        if env.notebook_metadata.get(doc, {}).get("mtime") != metadata["mtime"]:
+            env.notebook_metadata[doc] = metadata
 
-    # Build notebook tag map
-    for doc in env.found_docs:
-        path = app.env.doc2path(doc)
-        if path.endswith("ipynb"):
-            for tag in read_notebook_tags(path):
-                try:
-                    env.notebook_tag_map[tag].append(doc)
-                except KeyError:
-                    env.notebook_tag_map[tag] = [doc]
 
-    # If notebooks have been modified add all docnames from env.found_docs that match the tags to docnames
-    if any([app.env.doc2path(doc).endswith("ipynb") for doc in docnames]):
-        for tag in env.notebook_tag_map.keys():
-            if tag in env.found_docs:
-                # FIXME This doesn't seem to be working correctly as the pages aren't being rebuilt
-                docnames.append(doc)
+def build_tag_tree(tag_map: dict[str, list[str]]) -> dict[str, list[str]]:
+    """Group tags by the root of their namespace, e.g ``cloud/aws/ec2`` under ``cloud``."""
+    tag_tree = {}
+    for tag in sorted(tag_map):
+        root, _, suffix = tag.partition("/")
+        tag_tree.setdefault(root, []).append(suffix)
+    return tag_tree
 
 
 def add_notebook_tag_map_to_context(app, pagename, templatename, context, doctree):
+    """Add the notebook tags to the page context.
+
+    The tag tree and tags for each page are computed once per build by ``build_tag_map``
+    so they are passed by reference here.
+
+    """
     context["sorted"] = sorted
     context["notebook_tag_map"] = app.env.notebook_tag_map
-    tag_tree = {}
-    for tag in app.env.notebook_tag_map:
-        root, suffix = tag.split("/", 1)
-        try:
-            tag_tree[root].append(suffix)
-        except KeyError:
-            tag_tree[root] = [suffix]
-    context["notebook_tag_tree"] = tag_tree
-    context["notebook_tags"] = [
-        tag for tag, pages in app.env.notebook_tag_map.items() if pagename in pages
-    ]
+    context["notebook_tag_tree"] = app.env.notebook_tag_tree
+    context["notebook_tags"] = app.env.notebook_tags.get(pagename, [])
 
 
 class NotebookGalleryTocTree(TocTree):
@@ -165,8 +376,13 @@ class NotebookGalleryTocTree(TocTree):
         notebooks = [
             notebook for _, notebook in toctree[0].children[0].attributes["entries"]
         ]
-        grid_markdown = generate_notebook_grid_myst(notebooks=notebooks, env=self.env)
-        for node in parse_markdown(markdown=grid_markdown, state=self.state):
+        self.env.notebook_gallery_docs.add(self.env.docname)
+        for node in render_notebook_grid(
+            notebooks=notebooks,
+            env=self.env,
+            state=self.state,
+            source_info=self.get_source_info(),
+        ):
             gallery += node
 
         output += gallery
@@ -174,13 +390,18 @@ class NotebookGalleryTocTree(TocTree):
 
 
 def setup(app: Sphinx) -> dict:
+    app.connect("builder-inited", init_notebook_tag_map)
     app.connect("env-before-read-docs", build_tag_map)
+    app.connect("env-purge-doc", purge_notebook_gallery_doc)
+    app.connect("env-merge-info", merge_notebook_gallery_docs)
+    app.connect("env-merge-info", merge_notebook_metadata)
     app.connect("html-page-context", add_notebook_tag_map_to_context)
     app.add_directive("relatedexamples", RelatedExamples)
     app.add_directive("notebookgallerytoctree", NotebookGalleryTocTree)
 
     return {
         "version": "0.1",
+        "env_version": 4,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
@@ -1,5 +1,8 @@
+import hashlib
+import json
 import re
-from copy import deepcopy
+from functools import lru_cache
+from types import MappingProxyType
 from typing import TYPE_CHECKING
 
 import jinja2
@@ -8,6 +11,71 @@ from docutils import nodes
 if TYPE_CHECKING:
     import sphinx
 
+# Markers which show that a page contains placeholders that need templating
+TEMPLATE_MARKERS = ("{{", "~~~")
+
+# Template expressions, skipping ``${{ }}`` which is used by GitHub Actions
+PLACEHOLDER = re.compile(r"(?<!\$)\{\{.*?\}\}")
+
+# Shared environment for compiling the template expressions found in pages
+jinja_env = jinja2.Environment()
+
+
+@lru_cache(maxsize=512)
+def compile_template(source: str) -> jinja2.Template:
+    """Compile a template expression like ``{{ rapids_version }}``, reusing earlier compiles."""
+    return jinja_env.from_string(source)
+
+
+class SubstitutionContext:
+    """The ``rapids_version`` values that placeholders are substituted with in a build.
+
+    The values are copied into a read-only mapping when the config is loaded. Placeholders
+    for each key like ``{{ rapids_container }}`` are rendered up front so substituting them
+    is a dict lookup, any other expression is rendered the first time it is seen and then
+    cached. The fingerprint changes whenever any of the values do.
+
+    """
+
+    def __init__(self, values: dict):
+        self.values = MappingProxyType(dict(values))
+        self.fingerprint = hashlib.sha256(
+            json.dumps(values, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self.rendered = {
+            source: compile_template(source).render(self.values)
+            for source in (f"{{{{ {key} }}}}" for key in values)
+        }
+
+    def render(self, source: str) -> str:
+        try:
+            return self.rendered[source]
+        except KeyError:
+            rendered = self.rendered[source] = compile_template(source).render(
+                self.values
+            )
+            return rendered
+
+    def substitute_match(self, match: re.Match) -> str:
+        return self.render(match.group())
+
+    def substitute(self, text: str) -> str:
+        """Replace every placeholder in ``text``."""
+        if "{{" not in text:
+            return text
+        return PLACEHOLDER.sub(self.substitute_match, text)
+
+
+def get_substitution_context(app: "sphinx.application.Sphinx") -> SubstitutionContext:
+    """Get the substitution context for the current build, creating it if needed."""
+    try:
+        return app.rapids_substitution_context
+    except AttributeError:
+        context = app.rapids_substitution_context = SubstitutionContext(
+            app.config.rapids_version
+        )
+        return context
+
 
 class RapidsCustomNodeVisitor(nodes.SparseNodeVisitor):
     """
@@ -23,8 +91,14 @@ class RapidsCustomNodeVisitor(nodes.SparseNodeVisitor):
     https://sourceforge.net/p/docutils/code/9881/tree/trunk/docutils/docutils/nodes.py#l2630
     """
 
-    def __init__(self, app: "sphinx.application.Sphinx", *args, **kwargs):
+    def __init__(
+        self, app: "sphinx.application.Sphinx", *args, fast_path: bool = True, **kwargs
+    ):
         self.app = app
+        self.substitution_context = get_substitution_context(app)
+        # When enabled nodes without template markers are skipped and only nodes whose
+        # content actually changes are replaced in the tree
+        self.fast_path = fast_path
         super().__init__(*args, **kwargs)
 
     def visit_reference(self, node: nodes.reference) -> None:
@@ -42,30 +116,30 @@ class RapidsCustomNodeVisitor(nodes.SparseNodeVisitor):
         #   {'ids': [], 'classes': [], 'names': [], 'dupnames': [], 'backrefs': [],
         #    'internal': True, 'refid': 'use-an-azure-marketplace-vm-image'}
         #
-        if "refuri" not in node.attributes:
+        uri_str = node.attributes.get("refuri")
+        if uri_str is None:
+            return
+        if self.fast_path and "~~~" not in uri_str and "{{" not in uri_str:
             return
 
         # find templated bits in the URI and replace them with '{{' template markers that Jinja2 will understand
-        uri_str = deepcopy(node.attributes)["refuri"]
         uri_str = re.sub(r"~~~(.*?)~~~", r"{{ \1 }}", uri_str)
 
         # fill in appropriate values based on app context
-        node.attributes["refuri"] = re.sub(
-            r"(?<!\$)\{\{.*?\}\}", self.template_func, uri_str
-        )
-
-        # update the document
-        if node.parent:
-            node.parent.replace(node, node)
+        node.attributes["refuri"] = PLACEHOLDER.sub(self.template_func, uri_str)
 
     def visit_Text(self, node: nodes.Text) -> None:
         """
         Replace template strings in generic text.
         This roughly corresponds to HTML ``<p>``, ``<pre>``, and similar elements.
         """
-        new_node = nodes.Text(
-            re.sub(r"(?<!\$)\{\{.*?\}\}", self.template_func, node.astext())
-        )
+        text = node.astext()
+        if self.fast_path and "{{" not in text:
+            return
+        new_text = PLACEHOLDER.sub(self.template_func, text)
+        if self.fast_path and new_text == text:
+            return
+        new_node = nodes.Text(new_text)
         if node.parent:
             node.parent.replace(node, new_node)
 
@@ -74,8 +148,7 @@ class RapidsCustomNodeVisitor(nodes.SparseNodeVisitor):
         Replace template strings like ``{{ rapids_version }}`` with real
         values like ``24.10``.
         """
-        template = jinja2.Template(match.group())
-        return template.render(self.app.config.rapids_version)
+        return self.substitution_context.render(match.group())
 
 
 def version_template(
@@ -94,16 +167,96 @@ def version_template(
 
         The latest container image is {{ rapids_container }}.
 
+    Pages which didn't contain any placeholders when they were read are skipped.
+
     """
+    if docname not in app.env.rapids_templated_docs:
+        return
     doctree.walk(RapidsCustomNodeVisitor(app, doctree))
 
 
+def has_template_markers(text: str) -> bool:
+    return any(marker in text for marker in TEMPLATE_MARKERS)
+
+
+def doctree_has_template_markers(doctree: "sphinx.addnodes.document") -> bool:
+    """Check the nodes ``version_template`` rewrites for placeholders."""
+    if any("{{" in node for node in doctree.findall(nodes.Text)):
+        return True
+    return any(
+        has_template_markers(node.get("refuri", ""))
+        for node in doctree.findall(nodes.reference)
+    )
+
+
+def index_templated_doctree(
+    app: "sphinx.application.Sphinx", doctree: "sphinx.addnodes.document"
+) -> None:
+    """Record whether a page contains placeholders once it has been parsed.
+
+    The doctree is checked rather than the source so text from ``{include}`` and
+    ``{literalinclude}`` files and text generated by directives like ``relatedexamples``
+    is seen too.
+
+    """
+    if doctree_has_template_markers(doctree):
+        app.env.rapids_templated_docs.add(app.env.docname)
+    else:
+        app.env.rapids_templated_docs.discard(app.env.docname)
+
+
+def init_templated_docs(app: "sphinx.application.Sphinx") -> None:
+    if not hasattr(app.env, "rapids_templated_docs"):
+        app.env.rapids_templated_docs = set()
+
+
+def purge_templated_doc(
+    app: "sphinx.application.Sphinx",
+    env: "sphinx.environment.BuildEnvironment",
+    docname: str,
+) -> None:
+    env.rapids_templated_docs.discard(docname)
+
+
+def merge_templated_docs(
+    app: "sphinx.application.Sphinx",
+    env: "sphinx.environment.BuildEnvironment",
+    docnames: set[str],
+    other: "sphinx.environment.BuildEnvironment",
+) -> None:
+    env.rapids_templated_docs |= other.rapids_templated_docs & set(docnames)
+
+
+def get_retemplated_docs(
+    app: "sphinx.application.Sphinx", env: "sphinx.environment.BuildEnvironment"
+) -> list[str]:
+    """Mark pages containing placeholders as updated when ``rapids_version`` changes."""
+    fingerprint = get_substitution_context(app).fingerprint
+    if getattr(env, "rapids_version_fingerprint", None) == fingerprint:
+        return []
+    env.rapids_version_fingerprint = fingerprint
+    return sorted(env.rapids_templated_docs & env.all_docs.keys())
+
+
+def init_substitution_context(
+    app: "sphinx.application.Sphinx", config: "sphinx.config.Config"
+) -> None:
+    app.rapids_substitution_context = SubstitutionContext(config.rapids_version)
+
+
 def setup(app: "sphinx.application.Sphinx") -> None:
     app.add_config_value("rapids_version", {}, "html")
+    app.connect("config-inited", init_substitution_context)
+    app.connect("builder-inited", init_templated_docs)
+    app.connect("doctree-read", index_templated_doctree)
+    app.connect("env-purge-doc", purge_templated_doc)
+    app.connect("env-merge-info", merge_templated_docs)
+    app.connect("env-get-updated", get_retemplated_docs)
     app.connect("doctree-resolved", version_template)
 
     return {
         "version": "0.1",
+        "env_version": 2,
         "parallel_read_safe": True,
         "parallel_write_safe": True,
     }
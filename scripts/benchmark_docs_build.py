@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+# Benchmark how the custom extensions scale with the size of the docs.
+#
+# Generates a synthetic source tree next to a copy of the real conf.py, with markdown pages
+# using version placeholders, notebooks with tagged title cells and example directories full
+# of related files. Each site is built in-process and the cold build, no-op rebuild and
+# single notebook edit rebuild are timed, along with the time spent in walk_files,
+# build_tag_map and version_template as reported by the rapids_build_profiler extension.
+#
+#   uv run python scripts/benchmark_docs_build.py --notebooks 50 200 500
+
+import argparse
+import io
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nbformat
+from sphinx.application import Sphinx
+
+# Get the full path to the directory where this script lives
+script_dir = Path(__file__).resolve().parent
+repo_root = script_dir.parent
+
+sys.path.insert(0, str(repo_root / "extensions"))
+
+import rapids_related_examples  # noqa: E402
+import rapids_version_templating  # noqa: E402
+
+# Handlers reported alongside the build times, keyed by the column name
+PROFILED_HANDLERS = {
+    "walk_files": ("rapids_notebook_files", "html-page-context"),
+    "build_tag_map": ("rapids_related_examples", "env-before-read-docs"),
+    "version_template": ("rapids_version_templating", "doctree-resolved"),
+}
+
+# Intersphinx would fetch remote inventories on every cold build
+CONF_OVERRIDES = {
+    "intersphinx_mapping": {},
+    "rapids_build_profile": True,
+}
+
+PAGE = """# Platform {i}
+
+Install RAPIDS {{{{ rapids_version }}}} from the `{{{{ rapids_conda_channel }}}}` channel.
+
+```bash
+docker pull {{{{ rapids_container }}}}
+```
+
+```bash
+conda create -n rapids-{{{{ rapids_version }}}} {{{{ rapids_conda_channels }}}} \\
+    {{{{ rapids_conda_packages }}}}
+```
+
+## Related Examples
+
+```{{relatedexamples}}
+```
+"""
+
+
+def generate_site(
+    root: Path, pages: int, notebooks: int, related_files: int, tags_per_notebook: int
+) -> list[Path]:
+    """Write a synthetic source tree into ``root`` and return the notebook paths.
+
+    The theme templates, static files and extensions are symlinked from the repo so the
+    real ``conf.py`` can be used unchanged.
+
+    """
+    source = root / "source"
+    source.mkdir()
+    (root / "extensions").symlink_to(repo_root / "extensions")
+    for name in ["_templates", "_static"]:
+        (source / name).symlink_to(repo_root / "source" / name)
+    shutil.copy(repo_root / "source" / "conf.py", source / "conf.py")
+
+    platforms = [f"platforms/platform-{i}" for i in range(pages)]
+    examples = [f"example-{i}/notebook" for i in range(notebooks)]
+
+    (source / "index.md").write_text(
+        "# Benchmark\n\n```{toctree}\nexamples/index\n"
+        + "\n".join(platforms)
+        + "\n```\n"
+    )
+    (source / "platforms").mkdir()
+    for i, platform in enumerate(platforms):
+        (source / f"{platform}.md").write_text(PAGE.format(i=i))
+
+    (source / "examples").mkdir()
+    (source / "examples" / "index.md").write_text(
+        "# Workflow Examples\n\n```{notebookgallerytoctree}\n"
+        + "\n".join(examples)
+        + "\n```\n"
+    )
+
+    notebook_paths = []
+    for i, example in enumerate(examples):
+        title = nbformat.v4.new_markdown_cell(f"# Example notebook {i}")
+        title.metadata["tags"] = [
+            platforms[(i + j) % pages] for j in range(tags_per_notebook)
+        ] + [f"library/library-{i % 7}"]
+        cells = [
+            title,
+            nbformat.v4.new_markdown_cell(
+                "Uses the `{{ rapids_container }}` container image."
+            ),
+            nbformat.v4.new_code_cell(
+                "!pip install 'cudf-cu12=={{ rapids_pip_version }}' "
+                "--extra-index-url={{ rapids_pip_index }}"
+            ),
+        ]
+        path = source / "examples" / f"{example}.ipynb"
+        path.parent.mkdir(parents=True)
+        nbformat.write(nbformat.v4.new_notebook(cells=cells), str(path))
+        notebook_paths.append(path)
+
+        for j in range(related_files):
+            (path.parent / f"related-{j}.py").write_text(
+                f"# Related file {j} for example {i}\nprint('hello')\n" * 20
+            )
+        (path.parent / "requirements.txt").write_text(
+            "cudf=={{ rapids_pip_version }}\n"
+        )
+
+    return notebook_paths
+
+
+def reset_module_caches() -> None:
+    """Clear caches held by the extension modules so each build starts like a new process."""
+    rapids_related_examples.grid_cache.clear()
+    rapids_version_templating.compile_template.cache_clear()
+
+
+def build(root: Path, freshenv: bool = False) -> tuple[float, dict[str, float]]:
+    """Build the site and return the wall time and the time spent in each profiled handler."""
+    reset_module_caches()
+    start = time.perf_counter()
+    app = Sphinx(
+        srcdir=str(root / "source"),
+        confdir=str(root / "source"),
+        outdir=str(root / "build" / "html"),
+        doctreedir=str(root / "build" / "doctrees"),
+        buildername="dirhtml",
+        confoverrides=CONF_OVERRIDES,
+        status=None,
+        warning=io.StringIO(),
+        freshenv=freshenv,
+    )
+    app.build()
+    elapsed = time.perf_counter() - start
+
+    handlers = dict.fromkeys(PROFILED_HANDLERS, 0.0)
+    for row in app.rapids_build_profile.rows():
+        for column, (extension, event) in PROFILED_HANDLERS.items():
+            if (row["extension"], row["kind"], row["name"]) == (
+                extension,
+                "event",
+                event,
+            ):
+                handlers[column] += row["seconds"]
+    return elapsed, handlers
+
+
+def edit_notebook(path: Path) -> None:
+    """Change the body of a notebook without touching its title or tags."""
+    notebook = nbformat.read(str(path), as_version=4)
+    notebook.cells.append(nbformat.v4.new_markdown_cell("An extra paragraph."))
+    nbformat.write(notebook, str(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark docs builds on large sites")
+    parser.add_argument("--notebooks", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument(
+        "--pages", type=int, default=50, help="Number of pages with related examples"
+    )
+    parser.add_argument(
+        "--related-files",
+        type=int,
+        default=10,
+        help="Number of related files in each example directory",
+    )
+    parser.add_argument("--tags-per-notebook", type=int, default=3)
+    args = parser.parse_args()
+
+    columns = ["build", "time (s)", *PROFILED_HANDLERS]
+    print(
+        f"{'notebooks':>9} {columns[0]:<14} "
+        + " ".join(f"{c:>16}" for c in columns[1:])
+    )
+    for notebooks in args.notebooks:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            notebook_paths = generate_site(
+                root,
+                args.pages,
+                notebooks,
+                args.related_files,
+                args.tags_per_notebook,
+            )
+            results = [("cold", build(root, freshenv=True)), ("no-op", build(root))]
+            edit_notebook(notebook_paths[len(notebook_paths) // 2])
+            results.append(("notebook edit", build(root)))
+
+        for name, (elapsed, handlers) in results:
+            print(
+                f"{notebooks:>9} {name:<14} {elapsed:>16.2f} "
+                + " ".join(f"{seconds:>16.3f}" for seconds in handlers.values())
+            )
+
+
+if __name__ == "__main__":
+    main()
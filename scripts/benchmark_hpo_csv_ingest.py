@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# Benchmark CSV ingestion in the SageMaker HPO example for datasets split into shards.
+#
+# Writes a synthetic dataset with the Airline columns as 1, 4 and 16 CSV shards holding the
+# same total number of rows, then times HPODataCache.read_input_files reading the shards one
+# at a time and concurrently. Needs numpy and pyarrow.
+#
+#   python scripts/benchmark_hpo_csv_ingest.py --rows 2000000 --shards 1 4 16
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy
+import pyarrow
+import pyarrow.csv
+
+# Get the full path to the directory where this script lives
+script_dir = Path(__file__).resolve().parent
+repo_root = script_dir.parent
+
+sys.path.insert(0, str(repo_root / "source" / "examples" / "rapids-sagemaker-hpo"))
+
+import HPODatasets  # noqa: E402
+from HPODataCache import read_input_files  # noqa: E402
+
+
+def write_shards(root: Path, rows: int, shards: int) -> list[Path]:
+    """Write ``rows`` rows of random Airline-like data split into ``shards`` CSV files."""
+    rng = numpy.random.default_rng(0)
+    paths = []
+    for i in range(shards):
+        shard_rows = rows // shards + (i < rows % shards)
+        table = pyarrow.table(
+            {
+                column: rng.integers(0, 5000, shard_rows).astype("float32")
+                for column in HPODatasets.airline_feature_columns
+            }
+        )
+        path = root / f"shard-{i:03d}.csv"
+        pyarrow.csv.write_csv(table, str(path))
+        paths.append(path)
+    return paths
+
+
+def time_ingest(paths: list[Path], max_workers: int | None, repeat: int) -> float:
+    """Return the best wall time of reading every shard into one table."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        table = read_input_files(
+            [str(path) for path in paths],
+            "CSV",
+            HPODatasets.airline_feature_columns,
+            HPODatasets.airline_dtype,
+            max_workers=max_workers,
+        )
+        best = min(best, time.perf_counter() - start)
+        del table
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark sharded CSV ingestion in the SageMaker HPO example"
+    )
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'shards':>6} {'size (MB)':>10} {'sequential (s)':>15} {'concurrent (s)':>15}"
+        f" {'sequential MB/s':>16} {'concurrent MB/s':>16}"
+    )
+    for shards in args.shards:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            paths = write_shards(Path(tmpdir), args.rows, shards)
+            size = sum(path.stat().st_size for path in paths) / 1e6
+            sequential = time_ingest(paths, 1, args.repeat)
+            concurrent = time_ingest(paths, None, args.repeat)
+
+        print(
+            f"{shards:>6} {size:>10.1f} {sequential:>15.3f} {concurrent:>15.3f}"
+            f" {size / sequential:>16.1f} {size / concurrent:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
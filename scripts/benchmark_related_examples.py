@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# Benchmark the notebook card grids rendered by the rapids_related_examples extension.
+#
+# Generates synthetic sites with an increasing number of pages that show related examples
+# and builds each one in-process, with and without the parsed grid cache, reporting the
+# build time and how many times a grid had to be parsed from MyST.
+#
+#   uv run python scripts/benchmark_related_examples.py --pages 10 50 100 200
+
+import argparse
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import nbformat
+from sphinx.application import Sphinx
+
+# Get the full path to the directory where this script lives
+script_dir = Path(__file__).resolve().parent
+repo_root = script_dir.parent
+
+sys.path.insert(0, str(repo_root / "extensions"))
+
+import rapids_related_examples  # noqa: E402
+
+CONF = f"""
+import sys
+sys.path.insert(0, {str(repo_root / "extensions")!r})
+extensions = ["myst_nb", "sphinx_design", "rapids_related_examples"]
+nb_execution_mode = "off"
+suppress_warnings = ["myst.header", "myst.nested_header"]
+"""
+
+
+class NoCache(dict):
+    """Stand-in for the grid cache which never stores anything."""
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def generate_site(root: Path, pages: int, notebooks: int, groups: int) -> None:
+    """Write a site where each notebook is tagged with every page in one group of pages.
+
+    Pages in the same group therefore show identical lists of notebooks.
+
+    """
+    tags = [f"tags/tag-{i}" for i in range(pages)]
+    notebook_docs = [f"examples/nb-{i}/notebook" for i in range(notebooks)]
+
+    (root / "conf.py").write_text(CONF)
+    (root / "index.md").write_text(
+        "# Benchmark\n\n```{toctree}\nexamples/index\n" + "\n".join(tags) + "\n```\n"
+    )
+    (root / "examples").mkdir()
+    (root / "examples" / "index.md").write_text(
+        "# Examples\n\n```{notebookgallerytoctree}\n"
+        + "\n".join(doc.removeprefix("examples/") for doc in notebook_docs)
+        + "\n```\n"
+    )
+    (root / "tags").mkdir()
+    for tag in tags:
+        (root / f"{tag}.md").write_text(f"# {tag}\n\n```{{relatedexamples}}\n```\n")
+
+    for i, doc in enumerate(notebook_docs):
+        cell = nbformat.v4.new_markdown_cell(f"# Notebook {i}\n\nSome text.")
+        cell.metadata["tags"] = tags[i % groups :: groups]
+        path = root / f"{doc}.ipynb"
+        path.parent.mkdir(parents=True)
+        nbformat.write(nbformat.v4.new_notebook(cells=[cell]), str(path))
+
+
+def build(root: Path) -> float:
+    start = time.perf_counter()
+    app = Sphinx(
+        srcdir=str(root),
+        confdir=str(root),
+        outdir=str(root / "_build" / "html"),
+        doctreedir=str(root / "_build" / "doctrees"),
+        buildername="html",
+        status=None,
+        warning=io.StringIO(),
+        freshenv=True,
+    )
+    app.build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark related examples grid rendering"
+    )
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--notebooks", type=int, default=20)
+    parser.add_argument("--groups", type=int, default=5)
+    args = parser.parse_args()
+
+    parses = 0
+    parse_markdown = rapids_related_examples.parse_markdown
+
+    def counting_parse_markdown(*a, **kw):
+        nonlocal parses
+        parses += 1
+        return parse_markdown(*a, **kw)
+
+    rapids_related_examples.parse_markdown = counting_parse_markdown
+
+    # Warm up imports and caches outside of the timed builds
+    with tempfile.TemporaryDirectory() as tmpdir:
+        generate_site(Path(tmpdir), 1, 1, 1)
+        build(Path(tmpdir))
+
+    print(f"{'pages':>6} {'mode':<8} {'time (s)':>9} {'grid parses':>12}")
+    for pages in args.pages:
+        for mode, cache in [("uncached", NoCache()), ("cached", {})]:
+            rapids_related_examples.grid_cache = cache
+            parses = 0
+            with tempfile.TemporaryDirectory() as tmpdir:
+                root = Path(tmpdir)
+                generate_site(root, pages, args.notebooks, args.groups)
+                elapsed = build(root)
+            print(f"{pages:>6} {mode:<8} {elapsed:>9.2f} {parses:>12}")
+
+
+if __name__ == "__main__":
+    main()
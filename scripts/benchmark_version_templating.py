@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# Benchmark the doctree-resolved pass of the rapids_version_templating extension.
+#
+# Run a docs build first so that pickled doctrees exist, then run this script to time
+# the version templating visitor over every doctree with and without its fast path.
+#
+#   uv run make dirhtml
+#   uv run python scripts/benchmark_version_templating.py --doctrees build/doctrees
+
+import argparse
+import pickle
+import runpy
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from docutils.utils import Reporter
+
+# Get the full path to the directory where this script lives
+script_dir = Path(__file__).resolve().parent
+repo_root = script_dir.parent
+
+sys.path.insert(0, str(repo_root / "extensions"))
+
+from rapids_version_templating import RapidsCustomNodeVisitor  # noqa: E402
+
+
+class BenchmarkNodeVisitor(RapidsCustomNodeVisitor):
+    def unknown_visit(self, node):
+        """Ignore node types that other extensions only register during a real build."""
+
+
+def fresh_copy(doctree):
+    """Copy a doctree so each run starts from unmodified nodes.
+
+    Sphinx strips the reporter when pickling doctrees so a silent one is attached here.
+
+    """
+    copy = doctree.deepcopy()
+    copy.reporter = Reporter("", Reporter.SEVERE_LEVEL + 1, Reporter.SEVERE_LEVEL + 1)
+    return copy
+
+
+def load_doctrees(doctree_dir: Path) -> list:
+    doctrees = []
+    for path in sorted(doctree_dir.rglob("*.doctree")):
+        with open(path, "rb") as f:
+            doctrees.append(pickle.load(f))
+    return doctrees
+
+
+def walk_all(app, doctrees: list, fast_path: bool) -> None:
+    for doctree in doctrees:
+        doctree.walk(BenchmarkNodeVisitor(app, doctree, fast_path=fast_path))
+
+
+def time_mode(app, doctrees: list, fast_path: bool, repeat: int) -> float:
+    """Return the best wall time of walking fresh copies of every doctree."""
+    best = float("inf")
+    for _ in range(repeat):
+        copies = [fresh_copy(doctree) for doctree in doctrees]
+        start = time.perf_counter()
+        walk_all(app, copies, fast_path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_allocations(app, doctrees: list, fast_path: bool) -> tuple[int, int]:
+    """Return the number of allocated blocks and peak memory while walking every doctree."""
+    copies = [fresh_copy(doctree) for doctree in doctrees]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    walk_all(app, copies, fast_path)
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    return blocks, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the version templating doctree-resolved pass"
+    )
+    parser.add_argument(
+        "--doctrees",
+        type=Path,
+        default=repo_root / "build" / "doctrees",
+        help="Doctree directory from a previous build (default: build/doctrees)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    doctrees = load_doctrees(args.doctrees)
+    if not doctrees:
+        sys.exit(f"No doctrees found in {args.doctrees}, run a docs build first")
+
+    conf = runpy.run_path(str(repo_root / "source" / "conf.py"))
+    app = SimpleNamespace(config=SimpleNamespace(rapids_version=conf["rapids_version"]))
+
+    print(f"Walking {len(doctrees)} doctrees, best of {args.repeat}\n")
+    print(f"{'mode':<10} {'time (ms)':>10} {'new blocks':>12} {'peak (KiB)':>12}")
+    for name, fast_path in [("full", False), ("fast-path", True)]:
+        elapsed = time_mode(app, doctrees, fast_path, args.repeat)
+        blocks, peak = measure_allocations(app, doctrees, fast_path)
+        print(f"{name:<10} {elapsed * 1000:>10.1f} {blocks:>12} {peak / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,122 @@
 #!/usr/bin/env python
 # Run this script to generate the release issue checklist for easy pasting into GitHub
+#
+#   python scripts/gen_release_checklist_issue.py
+#
+# Use --format json to get the inventory of pages and their review priority instead, and
+# --cache to reuse the priorities of pages which haven't changed since the last run.
 
+import argparse
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import frontmatter
+import yaml
 
 # Get the full path to the directory where this script lives
 script_name = Path(__file__).resolve()
 script_dir = script_name.parent
+source_dir = script_dir.parent / "source"
 
-print(
-    """# Release checklist
+BASE_URL = "https://docs.rapids.ai/deployment/nightly/"
+
+PRIORITIES = {
+    "index": "Index/Non-technical",
+    "p0": "P0",
+    "p1": "P1",
+    "p2": "P2",
+}
+
+
+def find_pages(root: Path) -> list[Path]:
+    """Find all markdown pages under ``root``, skipping snippets in ``_includes``."""
+    pages = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [dirname for dirname in dirnames if dirname != "_includes"]
+        for filename in filenames:
+            if filename.endswith(".md"):
+                pages.append(Path(dirpath) / filename)
+    return pages
+
+
+def read_front_matter(path: Path) -> dict:
+    """Parse the YAML front matter of a markdown file without reading the rest of it."""
+    with open(path, encoding="utf-8") as reader:
+        if reader.readline().strip() != "---":
+            return {}
+        lines = []
+        for line in reader:
+            if line.strip() == "---":
+                return yaml.safe_load("".join(lines)) or {}
+            lines.append(line)
+    return {}
+
+
+def read_priority(path: Path) -> str:
+    return str(read_front_matter(path).get("review_priority", "p2"))
+
+
+def page_url(path: Path) -> str:
+    if path.name == "index.md":
+        rel_path = path.parent.relative_to(source_dir)
+    else:
+        rel_path = path.relative_to(source_dir).with_suffix("")
+    return BASE_URL + ("" if str(rel_path) == "." else str(rel_path))
+
+
+def load_cache(path: Path | None) -> dict:
+    if path is None:
+        return {}
+    try:
+        with open(path) as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path: Path | None, cache: dict) -> None:
+    if path is not None:
+        with open(path, "w") as writer:
+            json.dump(cache, writer, indent=2, sort_keys=True)
+
+
+def scan_pages(cache_path: Path | None = None) -> list[dict]:
+    """Return the URL and review priority of every page.
+
+    Front matter is read in parallel. If a cache file is given pages whose mtime hasn't
+    changed since the last run aren't read at all.
+
+    """
+    pages = {
+        str(page.relative_to(source_dir.parent)): page
+        for page in find_pages(source_dir)
+    }
+    cache = load_cache(cache_path)
+    mtimes = {file: page.stat().st_mtime_ns for file, page in pages.items()}
+    stale = [file for file in pages if cache.get(file, {}).get("mtime") != mtimes[file]]
+    with ThreadPoolExecutor() as executor:
+        priorities = executor.map(read_priority, [pages[file] for file in stale])
+        for file, priority in zip(stale, priorities, strict=True):
+            cache[file] = {"mtime": mtimes[file], "priority": priority}
+    cache = {file: cache[file] for file in pages}
+    save_cache(cache_path, cache)
+
+    inventory = []
+    for file, page in pages.items():
+        priority = cache[file]["priority"]
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown review_priority '{priority}' for page {page}")
+        inventory.append({"file": file, "url": page_url(page), "priority": priority})
+    return sorted(
+        inventory,
+        key=lambda page: (list(PRIORITIES).index(page["priority"]), page["url"]),
+    )
+
+
+def print_checklist(inventory: list[dict]) -> None:
+    print(
+        """# Release checklist
 
 For the upcoming release we need to verify our documentation. This is a best efforts activity
 so please refer to the checklist from the previous release and focus on pages that were not
@@ -26,62 +132,43 @@ verified last time.
 - If page needs updating convert the task to an issue and open a PR that closes the issue
 
 """
-)
+    )
 
-priority_lists = {
-    "index": {"name": "Index/Non-technical", "pages": []},
-    "p0": {"name": "P0", "pages": []},
-    "p1": {"name": "P1", "pages": []},
-    "p2": {"name": "P2", "pages": []},
-}
-
-# Walk all files recursively in the source directory
-for file in (script_dir.parent / "source").rglob("*"):
-    if file.is_file() and file.suffix in [".md"]:
-        if "_includes" in file.parts:
+    for priority, name in PRIORITIES.items():
+        pages = [page for page in inventory if page["priority"] == priority]
+        if not pages:
             continue
-        if "index.md" in file.parts:
-            rel_path = file.parent
-        else:
-            rel_path = file
-        rel_path = rel_path.relative_to(script_dir.parent / "source")
-        priority = "p2"
-        if file.suffix == ".md":
-            try:
-                priority = str(frontmatter.load(file).metadata["review_priority"])
-            except KeyError:
-                pass
-
-        if rel_path.name:
-            rel_path = str(rel_path.with_suffix(""))
-        elif str(rel_path) == ".":
-            rel_path = ""
-        else:
-            rel_path = str(rel_path)
-
-        file_info = {
-            "file": file,
-            "url": "https://docs.rapids.ai/deployment/nightly/" + rel_path,
-            "priority": priority,
-        }
-        if priority in priority_lists:
-            priority_lists[priority]["pages"].append(file_info)
-        else:
-            raise ValueError(f"Unknown review_priority '{priority}' for page {file}")
-
-for data in priority_lists.values():
-    pages = data["pages"]
-    if not pages:
-        continue
-    print(f"### {data['name']}\n")
-    for page in sorted(pages, key=lambda x: x["url"]):
-        print(f"- [ ] {page['url']}")
+        print(f"### {name}\n")
+        for page in pages:
+            print(f"- [ ] {page['url']}")
+        print()
+
+    print("## Update Scripts\n")
+    print(
+        "- [ ] [Colab: Update RAPIDS pip install script](https://github.com/rapidsai-community/rapidsai-csp-utils/blob/main/colab/pip-install.py)"
+    )
     print()
 
-print("## Update Scripts\n")
-print(
-    "- [ ] [Colab: Update RAPIDS pip install script](https://github.com/rapidsai-community/rapidsai-csp-utils/blob/main/colab/pip-install.py)"
-)
-print()
+    print(f"_Issue text generated by {script_name.parent.name}/{script_name.name}._")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the release checklist issue")
+    parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=None,
+        help="JSON file to cache page priorities in between runs",
+    )
+    args = parser.parse_args()
+
+    inventory = scan_pages(args.cache)
+    if args.format == "json":
+        print(json.dumps(inventory, indent=2))
+    else:
+        print_checklist(inventory)
+
 
-print(f"_Issue text generated by {script_name.parent.name}/{script_name.name}._")
+if __name__ == "__main__":
+    main()
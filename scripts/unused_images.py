@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# Find images in the docs source which aren't referenced anywhere, and flag oversized ones.
+#
+# Every markdown, notebook and Python file is read once, in parallel, and split into
+# tokens so each image can be checked with a set lookup. Exits with 1 if any unused
+# images are found.
+#
+#   python scripts/unused_images.py
+
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Get the full path to the directory where this script lives
+script_dir = Path(__file__).resolve().parent
+repo_root = script_dir.parent
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".gif", ".svg"}
+REFERENCE_SUFFIXES = {".md", ".ipynb", ".py"}
+
+# Characters which can't be part of an image filename in a markdown link, HTML attribute,
+# JSON string or Python string, so are used to split files into tokens
+TOKEN_SEPARATORS = re.compile(r"""[\s"'`()\[\]{}<>/\\=,;:|*!?#]+""")
+
+
+def find_files(root: Path) -> tuple[list[Path], list[Path]]:
+    """Return the images and the files which may reference them under ``root``."""
+    images, references = [], []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            suffix = os.path.splitext(filename)[1]
+            if suffix.lower() in IMAGE_SUFFIXES:
+                images.append(Path(dirpath) / filename)
+            if suffix in REFERENCE_SUFFIXES:
+                references.append(Path(dirpath) / filename)
+    return sorted(images), references
+
+
+def read_text(path: Path) -> str:
+    with open(path, encoding="utf-8", errors="replace") as reader:
+        return reader.read()
+
+
+def find_unused_images(
+    images: list[Path], references: list[Path], workers: int | None = None
+) -> list[Path]:
+    """Return the images whose filename doesn't appear in any of the references.
+
+    Filenames are looked up in a set of tokens from every reference first. The few which
+    aren't found that way, because they contain a separator or are joined onto some other
+    text, are then searched for as plain substrings.
+
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        contents = list(executor.map(read_text, references))
+
+    tokens = set()
+    for content in contents:
+        tokens.update(TOKEN_SEPARATORS.split(content))
+
+    unused = []
+    for image in images:
+        if image.name in tokens:
+            continue
+        if not any(image.name in content for content in contents):
+            unused.append(image)
+    return unused
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find unused and oversized images in the docs"
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=2048,
+        help="Flag images larger than this many KiB (default: 2048)",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    os.chdir(repo_root)
+    images, references = find_files(Path("source"))
+    references.append(Path("README.md"))
+
+    for image in images:
+        size = image.stat().st_size
+        if size > args.max_size * 1024:
+            print(f"Found oversized image {image} ({size / 1024:.0f} KiB)")
+
+    unused = find_unused_images(images, references, args.workers)
+    for image in unused:
+        print(f"Found unused image {image}")
+
+    if not unused:
+        print("No unused images found!")
+    else:
+        print(f"Found {len(unused)} unused images")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -87,6 +87,7 @@ extensions = [
     "rapids_grid_toctree",
     "rapids_version_templating",
     "rapids_admonitions",
+    "rapids_build_profiler",
     "sphinx_reredirects",
     "sphinx_llm.txt",
 ]
@@ -108,6 +109,11 @@ copybutton_line_continuation_character = "\\"
 
 suppress_warnings = ["myst.header", "myst.nested_header"]
 
+# Set DEPLOYMENT_DOCS_BUILD_PROFILE=true to report time spent in the custom extensions
+rapids_build_profile = (
+    os.environ.get("DEPLOYMENT_DOCS_BUILD_PROFILE", "false") == "true"
+)
+
 # -- Options for notebooks -------------------------------------------------
 
 nb_execution_mode = "off"
@@ -32,6 +32,7 @@ class HPOConfig:
         "train_data": "/opt/ml/input/data/training",
         "model_store": "/opt/ml/model",
         "output_artifacts": "/opt/ml/output",
+        "data_cache": "/opt/ml/sagemaker/warmpoolcache",
     }
 
     def __init__(
@@ -46,6 +47,8 @@ class HPOConfig:
             self.model_type,
             self.compute_type,
             self.cv_folds,
+            self.cv_strategy,
+            self.parallel_folds,
         ) = self.parse_configuration()
 
         # parse input parameters for HPO
@@ -65,6 +68,14 @@ class HPOConfig:
             "output_artifacts"
         ]  # noqa
 
+        # columnar ingestion cache [ single-CPU workflow ], only used when the
+        # directory exists, SageMaker creates it for warm pools with a
+        # persistent cache so that it's kept between jobs
+        data_cache_directory = directory_structure.get("data_cache")
+        if data_cache_directory is not None and not os.path.isdir(data_cache_directory):
+            data_cache_directory = None
+        self.data_cache_directory = data_cache_directory
+
     def parse_configuration(self):
         """Parse the ENV variables [ set in the dockerfile ]
         to determine configuration settings"""
@@ -75,6 +86,8 @@ class HPOConfig:
         model_type = "RandomForest"
         compute_type = "single-GPU"
         cv_folds = 3
+        cv_strategy = "holdout"
+        parallel_folds = 1
 
         try:
             # parse dataset choice
@@ -112,19 +125,41 @@ class HPOConfig:
         except KeyError as error:
             hpo_log.info(f"Configuration parser failed : {error}")
 
+        # parse CV strategy [ repeated holdout or k-fold ]
+        cv_strategy = os.environ.get("AWS_CV_STRATEGY", cv_strategy).lower()
+        if cv_strategy == "kfold" and "multi" in compute_type:
+            hpo_log.info("k-fold not supported by multi-node workflows, using holdout")
+            cv_strategy = "holdout"
+
+        # parse number of CV folds to run concurrently [ opt-in ]
+        parallel_folds = int(os.environ.get("AWS_PARALLEL_FOLDS", parallel_folds))
+        parallel_folds = min(parallel_folds, cv_folds)
+
         assert dataset_type in ["Airline", "NYCTaxi", "BYOData"]
         assert model_type in ["RandomForest", "XGBoost", "KMeans"]
         assert compute_type in ["single-GPU", "multi-GPU", "single-CPU", "multi-CPU"]
         assert cv_folds >= 1
+        assert cv_strategy in ["holdout", "kfold"]
+        assert cv_strategy == "holdout" or cv_folds >= 2
+        assert parallel_folds >= 1
 
         hpo_log.info(
             f"  Dataset: {dataset_type}\n"
             f"  Compute: {compute_type}\n"
             f"  Algorithm: {model_type}\n"
             f"  CV_folds: {cv_folds}\n"
+            f"  CV_strategy: {cv_strategy}\n"
+            f"  Parallel_folds: {parallel_folds}\n"
         )
 
-        return dataset_type, model_type, compute_type, cv_folds
+        return (
+            dataset_type,
+            model_type,
+            compute_type,
+            cv_folds,
+            cv_strategy,
+            parallel_folds,
+        )
 
     def parse_hyper_parameter_inputs(self, input_args):
         """Parse hyperparmeters provided by the HPO orchestrator"""
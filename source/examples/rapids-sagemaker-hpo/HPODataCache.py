@@ -0,0 +1,159 @@
+#
+# Copyright (c) 2026, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+"""
+Columnar ingestion cache for the single-CPU workflow.
+The detected input files are parsed once into an uncompressed Arrow IPC
+file, later jobs on the same warm pool instance memory-map it instead of
+parsing again [ the workflow still copies the table once into pandas ].
+"""
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pyarrow
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet
+
+hpo_log = logging.getLogger("hpo_log")
+
+
+def cache_key(target_files, dataset_columns, dataset_dtype):
+    """
+    Hash of the input files [ name, size ] and how they're parsed, SageMaker
+    downloads the training channel for every job so mtimes always change
+    """
+    files = sorted(
+        [os.path.basename(path), os.path.getsize(path)] for path in target_files
+    )
+    payload = json.dumps(
+        {"files": files, "columns": list(dataset_columns), "dtype": dataset_dtype}
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def read_csv_file(path, dataset_columns, dataset_dtype):
+    """Parse a CSV file, replacing its header with ``dataset_columns``"""
+    if dataset_columns:
+        read_options = pyarrow.csv.ReadOptions(
+            column_names=dataset_columns, skip_rows=1
+        )
+    else:
+        read_options = pyarrow.csv.ReadOptions()
+
+    column_types = None
+    if dataset_columns and dataset_dtype is not None:
+        column_types = dict.fromkeys(
+            dataset_columns, pyarrow.type_for_alias(dataset_dtype)
+        )
+
+    return pyarrow.csv.read_csv(
+        path,
+        read_options=read_options,
+        convert_options=pyarrow.csv.ConvertOptions(column_types=column_types),
+    )
+
+
+def read_input_files(
+    target_files, input_file_type, dataset_columns, dataset_dtype, max_workers=None
+):
+    """
+    Parse every input file [ not just the first ] into a single table.
+    Files are read concurrently, the pyarrow readers release the GIL,
+    and their tables are concatenated without copying the columns.
+    """
+    target_files = sorted(target_files)
+
+    if "Parquet" in input_file_type:
+        hpo_log.info("> parquet data ingestion")
+
+        def read_file(path):
+            return pyarrow.parquet.read_table(path, columns=dataset_columns or None)
+
+    elif "CSV" in input_file_type:
+        hpo_log.info("> csv data ingestion")
+
+        def read_file(path):
+            return read_csv_file(path, dataset_columns, dataset_dtype)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        tables = list(executor.map(read_file, target_files))
+
+    hpo_log.info(f"\t read {len(tables)} files")
+    return pyarrow.concat_tables(tables)
+
+
+def write_cache(table, cache_path):
+    """Write the table next to ``cache_path`` and move it into place"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with pyarrow.OSFile(tmp_path, "wb") as sink:
+            with pyarrow.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        # don't leave a partial copy of the dataset behind [ e.g., ENOSPC ]
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def load_dataset(hpo_config):
+    """
+    Arrow table of the detected input files, memory-mapped from the cache
+    directory when they've been parsed before [ same files, columns, dtype ]
+    """
+    cache_directory = hpo_config.data_cache_directory
+    if cache_directory is None:
+        return read_input_files(
+            hpo_config.target_files,
+            hpo_config.input_file_type,
+            hpo_config.dataset_columns,
+            hpo_config.dataset_dtype,
+        )
+
+    key = cache_key(
+        hpo_config.target_files,
+        hpo_config.dataset_columns,
+        hpo_config.dataset_dtype,
+    )
+    cache_path = os.path.join(cache_directory, f"hpo-dataset-{key}.arrow")
+
+    if os.path.exists(cache_path):
+        hpo_log.info(f"> loading ingestion cache {cache_path}")
+    else:
+        table = read_input_files(
+            hpo_config.target_files,
+            hpo_config.input_file_type,
+            hpo_config.dataset_columns,
+            hpo_config.dataset_dtype,
+        )
+        try:
+            write_cache(table, cache_path)
+        except OSError as error:
+            hpo_log.info(f"> unable to write ingestion cache : {error}")
+            return table
+        hpo_log.info(f"> wrote ingestion cache {cache_path}")
+        del table
+
+    # buffers of the returned table stay backed by the memory-mapped file
+    source = pyarrow.memory_map(cache_path, "r")
+    return pyarrow.ipc.open_file(source).read_all()
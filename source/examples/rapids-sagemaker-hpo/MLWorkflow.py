@@ -16,8 +16,12 @@
 
 import functools
 import logging
+import math
 import time
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
 
 hpo_log = logging.getLogger("hpo_log")
 
@@ -55,7 +59,7 @@ class MLWorkflow:
         pass
 
     @abstractmethod
-    def split_dataset(self, dataset, i_fold):
+    def split_dataset(self, X, y, i_fold):
         pass
 
     @abstractmethod
@@ -82,6 +86,150 @@ class MLWorkflow:
     def emit_final_score(self):
         pass
 
+    def prepare_dataset(self, dataset):
+        """
+        Drop missing samples, cast to the dataset dtype and separate the
+        features from the labels once, so CV folds only split the result
+        """
+        dataset = self.handle_missing_data(dataset)
+        dataset = dataset.astype(self.hpo_config.dataset_dtype)
+
+        label_column = self.hpo_config.label_column
+        X = dataset.drop(columns=label_column)
+        y = dataset[label_column]
+
+        # the raw ingested dataset isn't needed by the folds
+        self.dataset_cache = None
+        return X, y
+
+    def fold_indices(self, n_samples, i_fold):
+        """Integer train and test indices of a CV fold [ see cv_strategy ]"""
+        if self.hpo_config.cv_strategy == "kfold":
+            return kfold_indices(n_samples, self.hpo_config.cv_folds, i_fold)
+        return holdout_indices(n_samples, i_fold)
+
+    def run_fold(self, X, y, i_fold, **split_options):
+        """Split, fit, predict and score a single CV fold"""
+
+        # split into train and test set
+        X_train, X_test, y_train, y_test = self.split_dataset(
+            X, y, i_fold, **split_options
+        )
+
+        # train model
+        trained_model = self.fit(X_train, y_train)
+
+        # use trained model to predict target labels of test data
+        predictions = self.predict(trained_model, X_test)
+
+        # score test set predictions against ground truth
+        score = self.score(y_test, predictions)
+
+        return score, trained_model
+
+    def run_folds_parallel(self, X, y, parallel_folds):
+        """
+        Run all CV folds concurrently [ opt-in ], returning the score and
+        trained model of each in fold order. Workflows which can't share
+        their resources between folds run them one after another.
+        """
+        hpo_log.info("> parallel folds not supported by workflow, running in sequence")
+        return [
+            self.run_fold(X, y, i_fold) for i_fold in range(self.hpo_config.cv_folds)
+        ]
+
+    def run_folds_on_worker_groups(self, X, y, parallel_folds):
+        """
+        Run CV folds concurrently on the dask cluster at ``self.client``.
+        Workers are split into one group per parallel fold and each group
+        runs every ``parallel_folds``-th fold in turn, so the placement of
+        each fold's data and its score are the same from run to run.
+        Workflows persist each fold's data on the ``workers`` passed to
+        their split_dataset.
+        """
+        workers = sorted(self.client.scheduler_info()["workers"])
+        parallel_folds = min(parallel_folds, len(workers))
+        hpo_log.info(
+            f"> running {parallel_folds} folds in parallel"
+            f" across {len(workers)} workers"
+        )
+
+        def run_worker_group_folds(i_group):
+            return [
+                self.run_fold(X, y, i_fold, workers=workers[i_group::parallel_folds])
+                for i_fold in range(i_group, self.hpo_config.cv_folds, parallel_folds)
+            ]
+
+        with ThreadPoolExecutor(max_workers=parallel_folds) as executor:
+            group_results = list(
+                executor.map(run_worker_group_folds, range(parallel_folds))
+            )
+
+        # interleave the results of each worker group back into fold order
+        return [
+            group_results[i_fold % parallel_folds][i_fold // parallel_folds]
+            for i_fold in range(self.hpo_config.cv_folds)
+        ]
+
+    def record_fold(self, score, trained_model):
+        """Keep the fold score and save the model [ if it sets a new-high score ]"""
+        self.cv_fold_scores.append(score)
+        self.save_best_model(score, trained_model)
+
+
+def holdout_indices(n_samples, i_fold, test_size=0.25):
+    """
+    Shuffle with the fold index as seed and hold out ``test_size`` of the
+    samples, the same split as sklearn's train_test_split(random_state=i_fold)
+
+    >>> from sklearn.model_selection import ShuffleSplit
+    >>> all(
+    ...     [index.tolist() for index in holdout_indices(n_samples, i_fold)]
+    ...     == [
+    ...         index.tolist()
+    ...         for index in next(
+    ...             ShuffleSplit(1, test_size=0.25, random_state=i_fold).split(
+    ...                 range(n_samples)
+    ...             )
+    ...         )
+    ...     ]
+    ...     for n_samples in [10, 1001]
+    ...     for i_fold in range(5)
+    ... )
+    True
+    """
+    n_test = math.ceil(test_size * n_samples)
+    permutation = numpy.random.RandomState(i_fold).permutation(n_samples)
+    return permutation[n_test:], permutation[:n_test]
+
+
+@functools.lru_cache(maxsize=1)
+def kfold_permutation(n_samples):
+    """Shuffled sample order shared by every k-fold split [ computed once ]"""
+    return numpy.random.RandomState(0).permutation(n_samples)
+
+
+def kfold_indices(n_samples, cv_folds, i_fold):
+    """
+    Test on the ``i_fold``-th of ``cv_folds`` disjoint parts of the
+    shuffled samples and train on the rest, indices are sorted so
+    taking the fold rows reads the prepared data in order
+
+    >>> from sklearn.model_selection import KFold
+    >>> splits = KFold(3, shuffle=True, random_state=0).split(range(10))
+    >>> all(
+    ...     [index.tolist() for index in kfold_indices(10, 3, i_fold)]
+    ...     == [sorted(train.tolist()), sorted(test.tolist())]
+    ...     for i_fold, (train, test) in enumerate(splits)
+    ... )
+    True
+    """
+    permutation = kfold_permutation(n_samples)
+    test_index = numpy.sort(numpy.array_split(permutation, cv_folds)[i_fold])
+    train_mask = numpy.ones(n_samples, dtype=bool)
+    train_mask[test_index] = False
+    return numpy.flatnonzero(train_mask), test_index
+
 
 def timer_decorator(target_function):
     @functools.wraps(target_function)
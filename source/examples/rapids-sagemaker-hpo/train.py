@@ -26,33 +26,31 @@ def train():
     hpo_config = HPOConfig(input_args=sys.argv[1:])
     ml_workflow = create_workflow(hpo_config)
 
-    # cross-validation to improve robustness via multiple train/test reshuffles
-    for i_fold in range(hpo_config.cv_folds):
-        # ingest
-        dataset = ml_workflow.ingest_data()
-
-        # handle missing samples [ drop ]
-        dataset = ml_workflow.handle_missing_data(dataset)
-
-        # split into train and test set
-        X_train, X_test, y_train, y_test = ml_workflow.split_dataset(
-            dataset, random_state=i_fold
-        )
-
-        # train model
-        trained_model = ml_workflow.fit(X_train, y_train)
-
-        # use trained model to predict target labels of test data
-        predictions = ml_workflow.predict(trained_model, X_test)
-
-        # score test set predictions against ground truth
-        score = ml_workflow.score(y_test, predictions)
-
-        # save trained model [ if it sets a new-high score ]
-        ml_workflow.save_best_model(score, trained_model)
-
-        # restart cluster to avoid memory creep [ for multi-CPU/GPU ]
-        ml_workflow.cleanup(i_fold)
+    # ingest, clean, cast and separate labels once, shared by every fold
+    dataset = ml_workflow.ingest_data()
+    X, y = ml_workflow.prepare_dataset(dataset)
+    del dataset
+
+    if hpo_config.parallel_folds > 1:
+        # cross-validation folds run concurrently [ opt-in ]; results in fold order
+        fold_results = ml_workflow.run_folds_parallel(X, y, hpo_config.parallel_folds)
+        for score, trained_model in fold_results:
+            ml_workflow.record_fold(score, trained_model)
+
+        # close cluster [ for multi-CPU/GPU ]
+        ml_workflow.cleanup(hpo_config.cv_folds - 1)
+
+    else:
+        # cross-validation to improve robustness via multiple train/test reshuffles
+        for i_fold in range(hpo_config.cv_folds):
+            # split, train, predict and score
+            score, trained_model = ml_workflow.run_fold(X, y, i_fold)
+
+            # save trained model [ if it sets a new-high score ]
+            ml_workflow.record_fold(score, trained_model)
+
+            # end of fold [ closes the cluster after the last fold for multi-CPU/GPU ]
+            ml_workflow.cleanup(i_fold)
 
     # emit final score to cloud HPO [i.e., SageMaker]
     ml_workflow.emit_final_score()
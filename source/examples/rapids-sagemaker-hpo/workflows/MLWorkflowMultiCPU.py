@@ -106,36 +106,34 @@ class MLWorkflowMultiCPU(MLWorkflow):
         return dataset
 
     @timer_decorator
-    def split_dataset(self, dataset, random_state):
+    def prepare_dataset(self, dataset):
         """
-        Split dataset into train and test data subsets,
-        currently using CV-fold index for randomness.
-        Plan to refactor with dask_ml KFold
+        Prepare the dataset once and persist it on the cluster,
+        so each fold splits data which is already in worker memory
         """
+        X, y = super().prepare_dataset(dataset)
+        X, y = self.client.persist([X, y])
+        wait([X, y])
+        return X, y
 
+    @timer_decorator
+    def split_dataset(self, X, y, i_fold, workers=None):
+        """
+        Split the prepared features and labels into train and test subsets,
+        using the CV-fold index for randomness [ repeated holdout only,
+        partitioned frames have no positional indexing for fold_indices ].
+        Data is persisted on ``workers`` if given, otherwise on any worker.
+        """
         hpo_log.info("> train-test split")
-        label_column = self.hpo_config.label_column
-
-        train, test = train_test_split(dataset, random_state=random_state)
 
-        # build X [ features ], y [ labels ] for the train and test subsets
-        y_train = train[label_column]
-        X_train = train.drop(label_column, axis=1)
-        y_test = test[label_column]
-        X_test = test.drop(label_column, axis=1)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=i_fold)
 
-        # persist
-        X_train = X_train.persist()
-        y_train = y_train.persist()
+        # persist [ on the fold's workers when folds run in parallel ]
+        X_train, y_train = self.client.persist([X_train, y_train], workers=workers)
 
         wait([X_train, y_train])
 
-        return (
-            X_train.astype(self.hpo_config.dataset_dtype),
-            X_test.astype(self.hpo_config.dataset_dtype),
-            y_train.astype(self.hpo_config.dataset_dtype),
-            y_test.astype(self.hpo_config.dataset_dtype),
-        )
+        return X_train, X_test, y_train, y_test
 
     @timer_decorator
     def fit(self, X_train, y_train):
@@ -203,9 +201,12 @@ class MLWorkflowMultiCPU(MLWorkflow):
         )
 
         hpo_log.info(f"\t score = {score}")
-        self.cv_fold_scores.append(score)
         return score
 
+    def run_folds_parallel(self, X, y, parallel_folds):
+        """Run CV folds concurrently on groups of dask workers [ opt-in ]"""
+        return self.run_folds_on_worker_groups(X, y, parallel_folds)
+
     def save_best_model(self, score, trained_model, filename="saved_model"):
         """Persist/save model that sets a new high score"""
 
@@ -223,20 +224,17 @@ class MLWorkflowMultiCPU(MLWorkflow):
                 joblib.dump(trained_model, f"{output_filename}_mcpu_kmeans")
 
     @timer_decorator
-    async def cleanup(self, i_fold):
+    def cleanup(self, i_fold):
         """
-        Close and restart the cluster when multiple cross validation
-        folds are used to prevent memory creep.
+        Close the cluster after the last cross validation fold, it's kept
+        between folds as it holds the prepared dataset they all share.
         """
         if i_fold == self.hpo_config.cv_folds - 1:
             hpo_log.info("> done all folds; closing cluster\n")
-            await self.client.close()
-            await self.cluster.close()
-        elif i_fold < self.hpo_config.cv_folds - 1:
-            hpo_log.info("> end of fold; reinitializing cluster\n")
-            await self.client.close()
-            await self.cluster.close()
-            self.cluster, self.client = self.cluster_initialize()
+            self.client.close()
+            self.cluster.close()
+        else:
+            hpo_log.info("> end of fold \n")
 
     def emit_final_score(self):
         """Emit score for parsing by the cloud HPO orchestrator"""
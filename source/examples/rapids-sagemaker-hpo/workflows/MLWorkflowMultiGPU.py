@@ -111,39 +111,41 @@ class MLWorkflowMultiGPU(MLWorkflow):
         return dataset
 
     @timer_decorator
-    def split_dataset(self, dataset, random_state):
+    def prepare_dataset(self, dataset):
         """
-        Split dataset into train and test data subsets,
-        currently using CV-fold index for randomness.
-        Plan to refactor with dask_ml KFold
+        Prepare the dataset once and persist it on the cluster,
+        so each fold splits data which is already in worker memory
         """
-        hpo_log.info("> train-test split")
-        label_column = self.hpo_config.label_column
+        X, y = super().prepare_dataset(dataset)
+        X, y = persist_across_workers(
+            self.client, [X, y], workers=self.client.has_what().keys()
+        )
+        wait([X, y])
+        return X, y
 
-        train, test = train_test_split(dataset, random_state=random_state)
+    @timer_decorator
+    def split_dataset(self, X, y, i_fold, workers=None):
+        """
+        Split the prepared features and labels into train and test subsets,
+        using the CV-fold index for randomness [ repeated holdout only,
+        partitioned frames have no positional indexing for fold_indices ].
+        Data is persisted on ``workers`` if given, otherwise across all workers.
+        """
+        hpo_log.info("> train-test split")
 
-        # build X [ features ], y [ labels ] for the train and test subsets
-        y_train = train[label_column]
-        X_train = train.drop(label_column, axis=1)
-        y_test = test[label_column]
-        X_test = test.drop(label_column, axis=1)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, random_state=i_fold)
 
         # force execution
         X_train, y_train, X_test, y_test = persist_across_workers(
             self.client,
             [X_train, y_train, X_test, y_test],
-            workers=self.client.has_what().keys(),
+            workers=workers or self.client.has_what().keys(),
         )
 
         # wait!
         wait([X_train, y_train, X_test, y_test])
 
-        return (
-            X_train.astype(self.hpo_config.dataset_dtype),
-            X_test.astype(self.hpo_config.dataset_dtype),
-            y_train.astype(self.hpo_config.dataset_dtype),
-            y_test.astype(self.hpo_config.dataset_dtype),
-        )
+        return X_train, X_test, y_train, y_test
 
     @timer_decorator
     def fit(self, X_train, y_train):
@@ -214,9 +216,12 @@ class MLWorkflowMultiGPU(MLWorkflow):
         )
 
         hpo_log.info(f"\t score = {score}")
-        self.cv_fold_scores.append(score)
         return score
 
+    def run_folds_parallel(self, X, y, parallel_folds):
+        """Run CV folds concurrently on groups of dask workers [ opt-in ]"""
+        return self.run_folds_on_worker_groups(X, y, parallel_folds)
+
     def save_best_model(self, score, trained_model, filename="saved_model"):
         """Persist/save model that sets a new high score"""
 
@@ -235,20 +240,17 @@ class MLWorkflowMultiGPU(MLWorkflow):
                 joblib.dump(trained_model, f"{output_filename}_mgpu_kmeans")
 
     @timer_decorator
-    async def cleanup(self, i_fold):
+    def cleanup(self, i_fold):
         """
-        Close and restart the cluster when multiple cross validation folds
-        are used to prevent memory creep.
+        Close the cluster after the last cross validation fold, it's kept
+        between folds as it holds the prepared dataset they all share.
         """
         if i_fold == self.hpo_config.cv_folds - 1:
             hpo_log.info("> done all folds; closing cluster")
-            await self.client.close()
-            await self.cluster.close()
-        elif i_fold < self.hpo_config.cv_folds - 1:
-            hpo_log.info("> end of fold; reinitializing cluster")
-            await self.client.close()
-            await self.cluster.close()
-            self.cluster, self.client = self.cluster_initialize()
+            self.client.close()
+            self.cluster.close()
+        else:
+            hpo_log.info("> end of fold")
 
     def emit_final_score(self):
         """Emit score for parsing by the cloud HPO orchestrator"""
@@ -15,20 +15,32 @@
 #
 
 import logging
+import multiprocessing
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import joblib
-import pandas
 import xgboost
+from HPODataCache import load_dataset
 from MLWorkflow import MLWorkflow, timer_decorator
 from sklearn.cluster import KMeans
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
-from sklearn.model_selection import train_test_split
+from threadpoolctl import threadpool_limits
 
 hpo_log = logging.getLogger("hpo_log")
 
+# workflow and prepared data inherited by forked fold processes [ avoids pickling ]
+_parallel_fold_state = None
+
+
+def _run_parallel_fold(i_fold):
+    ml_workflow, X, y = _parallel_fold_state
+    # keep native thread pools [ e.g., OpenMP in KMeans ] to the fold's cores
+    with threadpool_limits(limits=ml_workflow.n_jobs):
+        return ml_workflow.run_fold(X, y, i_fold)
+
 
 class MLWorkflowSingleCPU(MLWorkflow):
     """Single-CPU Workflow"""
@@ -43,40 +55,20 @@ class MLWorkflowSingleCPU(MLWorkflow):
         self.cv_fold_scores = []
         self.best_score = -1
 
+        # cores used to fit each model [ -1 uses all cores ]
+        self.n_jobs = -1
+
     @timer_decorator
     def ingest_data(self):
-        """Ingest dataset, CSV and Parquet supported"""
+        """Ingest dataset, CSV and Parquet supported [ via Arrow cache ]"""
 
         if self.dataset_cache is not None:
             hpo_log.info("> skipping ingestion, using cache")
             return self.dataset_cache
 
-        if "Parquet" in self.hpo_config.input_file_type:
-            hpo_log.info("> parquet data ingestion")
-
-            # assert isinstance(self.hpo_config.target_files, str)
-            filepath = self.hpo_config.target_files
-
-            dataset = pandas.read_parquet(
-                filepath,
-                columns=self.hpo_config.dataset_columns,  # noqa
-                engine="pyarrow",
-            )
-
-        elif "CSV" in self.hpo_config.input_file_type:
-            hpo_log.info("> csv data ingestion")
-
-            if isinstance(self.hpo_config.target_files, list):
-                filepath = self.hpo_config.target_files[0]
-            elif isinstance(self.hpo_config.target_files, str):
-                filepath = self.hpo_config.target_files
-
-            dataset = pandas.read_csv(
-                filepath,
-                names=self.hpo_config.dataset_columns,
-                dtype=self.hpo_config.dataset_dtype,
-                header=0,
-            )
+        # all input files, parsed once if the columnar ingestion cache is
+        # enabled; to_pandas copies the table into one consolidated block
+        dataset = load_dataset(self.hpo_config).to_pandas()
 
         hpo_log.info(f"\t dataset shape: {dataset.shape}")
         self.dataset_cache = dataset
@@ -89,27 +81,20 @@ class MLWorkflowSingleCPU(MLWorkflow):
         return dataset
 
     @timer_decorator
-    def split_dataset(self, dataset, random_state):
+    def split_dataset(self, X, y, i_fold):
         """
-        Split dataset into train and test data subsets,
-        currently using CV-fold index for randomness.
-        Plan to refactor with sklearn KFold
+        Split the prepared features and labels into train and test subsets
+        by taking the rows of the fold's indices [ see cv_strategy ]
         """
 
         hpo_log.info("> train-test split")
-        label_column = self.hpo_config.label_column
-
-        X_train, X_test, y_train, y_test = train_test_split(
-            dataset.loc[:, dataset.columns != label_column],
-            dataset[label_column],
-            random_state=random_state,
-        )
+        train_index, test_index = self.fold_indices(len(X), i_fold)
 
         return (
-            X_train.astype(self.hpo_config.dataset_dtype),
-            X_test.astype(self.hpo_config.dataset_dtype),
-            y_train.astype(self.hpo_config.dataset_dtype),
-            y_test.astype(self.hpo_config.dataset_dtype),
+            X.take(train_index),
+            X.take(test_index),
+            y.take(train_index),
+            y.take(test_index),
         )
 
     @timer_decorator
@@ -119,9 +104,12 @@ class MLWorkflowSingleCPU(MLWorkflow):
             hpo_log.info("> fit xgboost model")
             dtrain = xgboost.DMatrix(data=X_train, label=y_train)
             num_boost_round = self.hpo_config.model_params["num_boost_round"]
+            params = dict(self.hpo_config.model_params)
+            if self.n_jobs > 0:
+                params["nthread"] = self.n_jobs
             trained_model = xgboost.train(
                 dtrain=dtrain,
-                params=self.hpo_config.model_params,
+                params=params,
                 num_boost_round=num_boost_round,
             )
 
@@ -132,7 +120,7 @@ class MLWorkflowSingleCPU(MLWorkflow):
                 max_depth=self.hpo_config.model_params["max_depth"],
                 max_features=self.hpo_config.model_params["max_features"],
                 bootstrap=self.hpo_config.model_params["bootstrap"],
-                n_jobs=-1,
+                n_jobs=self.n_jobs,
             ).fit(X_train, y_train)
 
         elif "KMeans" in self.hpo_config.model_type:
@@ -171,9 +159,34 @@ class MLWorkflowSingleCPU(MLWorkflow):
         )
 
         hpo_log.info(f"\t score = {score}")
-        self.cv_fold_scores.append(score)
         return score
 
+    def run_folds_parallel(self, X, y, parallel_folds):
+        """
+        Run CV folds concurrently in forked processes [ opt-in ],
+        each fold gets an equal share of the CPU cores to fit with.
+        Results are collected in fold order so scores stay deterministic.
+        """
+        global _parallel_fold_state
+
+        self.n_jobs = max(1, os.cpu_count() // parallel_folds)
+        hpo_log.info(
+            f"> running {parallel_folds} folds in parallel, {self.n_jobs} cores each"
+        )
+
+        _parallel_fold_state = (self, X, y)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=parallel_folds,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                return list(
+                    executor.map(_run_parallel_fold, range(self.hpo_config.cv_folds))
+                )
+        finally:
+            _parallel_fold_state = None
+            self.n_jobs = -1
+
     def save_best_model(self, score, trained_model, filename="saved_model"):
         """Persist/save model that sets a new high score"""
 
@@ -46,7 +46,7 @@ class MLWorkflowSingleGPU(MLWorkflow):
 
     @timer_decorator
     def ingest_data(self):
-        """Ingest dataset, CSV and Parquet supported"""
+        """Ingest dataset, CSV and Parquet supported [ all input files ]"""
 
         if self.dataset_cache is not None:
             hpo_log.info("skipping ingestion, using cache")
@@ -58,14 +58,15 @@ class MLWorkflowSingleGPU(MLWorkflow):
             )  # noqa
 
         elif "CSV" in self.hpo_config.input_file_type:
-            if isinstance(self.hpo_config.target_files, list):
-                filepath = self.hpo_config.target_files[0]
-            elif isinstance(self.hpo_config.target_files, str):
-                filepath = self.hpo_config.target_files
-
             hpo_log.info(self.hpo_config.dataset_columns)
-            dataset = cudf.read_csv(
-                filepath, names=self.hpo_config.dataset_columns, header=0
+            dataset = cudf.concat(
+                [
+                    cudf.read_csv(
+                        filepath, names=self.hpo_config.dataset_columns, header=0
+                    )
+                    for filepath in self.hpo_config.target_files
+                ],
+                ignore_index=True,
             )
 
         hpo_log.info(
@@ -83,25 +84,24 @@ class MLWorkflowSingleGPU(MLWorkflow):
         return dataset
 
     @timer_decorator
-    def split_dataset(self, dataset, random_state):
+    def split_dataset(self, X, y, i_fold):
         """
-        Split dataset into train and test data subsets,
-        currently using CV-fold index for randomness.
-        Plan to refactor with sklearn KFold
+        Split the prepared features and labels into train and test subsets.
+        Holdout keeps cuml's train_test_split, seeded by the CV-fold index,
+        since its cupy shuffle picks different rows than fold_indices;
+        k-fold takes the rows of the fold's indices.
         """
 
         hpo_log.info("> train-test split")
-        label_column = self.hpo_config.label_column
-
-        X_train, X_test, y_train, y_test = train_test_split(
-            dataset, label_column, random_state=random_state
-        )
+        if self.hpo_config.cv_strategy != "kfold":
+            return train_test_split(X, y, random_state=i_fold)
 
+        train_index, test_index = self.fold_indices(len(X), i_fold)
         return (
-            X_train.astype(self.hpo_config.dataset_dtype),
-            X_test.astype(self.hpo_config.dataset_dtype),
-            y_train.astype(self.hpo_config.dataset_dtype),
-            y_test.astype(self.hpo_config.dataset_dtype),
+            X.take(train_index),
+            X.take(test_index),
+            y.take(train_index),
+            y.take(test_index),
         )
 
     @timer_decorator
@@ -162,7 +162,6 @@ class MLWorkflowSingleGPU(MLWorkflow):
         )
 
         hpo_log.info(f"score = {round(score,5)}")
-        self.cv_fold_scores.append(score)
         return score
 
     def save_best_model(self, score, trained_model, filename="saved_model"):